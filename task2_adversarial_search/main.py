@@ -1,8 +1,35 @@
 import sys
-from src.ui import GoGameUI
-from src.game import GameState
 
 def main():
+    if '--gtp' in sys.argv[1:]:
+        # Headless GTP mode: keep stdout clean and never import pygame
+        from src.engine.gtp import GtpEngine
+        GtpEngine().run()
+        return
+
+    if '--analyze' in sys.argv[1:]:
+        from src.engine.analysis import main as analyze
+        analyze([arg for arg in sys.argv[1:] if arg != '--analyze'])
+        return
+
+    if '--serve' in sys.argv[1:]:
+        from src.engine.server import main as serve
+        serve([arg for arg in sys.argv[1:] if arg != '--serve'])
+        return
+
+    if '--build-patterns' in sys.argv[1:]:
+        from src.ai.patterns import main as build_patterns
+        build_patterns([arg for arg in sys.argv[1:] if arg != '--build-patterns'])
+        return
+
+    if '--tune' in sys.argv[1:]:
+        from src.ai.tuning import main as tune
+        tune([arg for arg in sys.argv[1:] if arg != '--tune'])
+        return
+
+    from src.ui import GoGameUI
+    from src.game import GameState
+
     print("=" * 60)
     print("Go Game 9x9 - Adversarial Search")
     print("Task 2: Introduction to AI - Final Project")
@@ -18,6 +45,7 @@ def main():
     print("  - 'Pass' button to pass your turn")
     print("  - 'New Game' to start over")
     print("  - 'PvP' / 'PvAI' to switch game mode")
+    print("\nRun 'python main.py --gtp' for a headless GTP engine.")
     print("\nStarting game...\n")
     
     try:
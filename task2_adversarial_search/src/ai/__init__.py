@@ -1,4 +1,8 @@
 from .minimax import MinimaxAI
 from .heuristic import GoHeuristic
+from .patterns import PatternTable
+from .transposition import TranspositionTable
+from .position_cache import PositionCache
+from .tactics import TacticalReader
 
-__all__ = ['MinimaxAI', 'GoHeuristic']
+__all__ = ['MinimaxAI', 'GoHeuristic', 'PatternTable', 'TranspositionTable', 'PositionCache', 'TacticalReader']
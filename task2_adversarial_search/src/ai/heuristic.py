@@ -1,4 +1,9 @@
+import json
+import os
+from collections import OrderedDict
 from ..game.board import GoBoard
+from ..game.benson import BensonLife
+from .tactics import TacticalReader
 
 class GoHeuristic:
     
@@ -9,10 +14,39 @@ class GoHeuristic:
         'liberties': 1.5,
         'center_control': 1.2,
         'group_strength': 1.3,
+        'tactics': 1.5,
     }
     
+    # Order of the terms returned by getFeatures
+    FEATURES = ['stone_count', 'territory', 'liberties', 'center_control', 'group_strength',
+                'tactics']
+    
+    # Tuned weights file loaded at import time, if set
+    WEIGHTS_ENV = 'GO_WEIGHTS'
+    
+    # Evaluation cache: feature vectors (not scores, so changing WEIGHTS
+    # keeps it valid) keyed by position hash, least recently used evicted.
+    # With SHARE_COLOURS one entry from Black's side serves both colours,
+    # as every term is a player-minus-opponent difference
+    CACHE_SIZE = 100000
+    SHARE_COLOURS = True
+    _cache = OrderedDict()
+    cache_hits = 0
+    cache_misses = 0
+    
     @staticmethod
     def evaluate(board, player_color):
+        features = GoHeuristic._cachedFeatures(board, player_color)
+        
+        # Weighted sum
+        score = 0.0
+        for name, value in zip(GoHeuristic.FEATURES, features):
+            score += GoHeuristic.WEIGHTS[name] * value
+        
+        return score
+    
+    @staticmethod
+    def getFeatures(board, player_color):
         opponent_color = GoBoard.WHITE if player_color == GoBoard.BLACK else GoBoard.BLACK
         
         # Calculate individual factors
@@ -21,17 +55,71 @@ class GoHeuristic:
         liberty_diff = GoHeuristic._libertyDiff(board, player_color, opponent_color)
         center_diff = GoHeuristic._centerControlDiff(board, player_color, opponent_color)
         group_strength_diff = GoHeuristic._groupStrengthDiff(board, player_color, opponent_color)
+        tactics_diff = GoHeuristic._tacticsDiff(board, player_color, opponent_color)
         
-        # Weighted sum
-        score = (
-            GoHeuristic.WEIGHTS['stone_count'] * stone_diff +
-            GoHeuristic.WEIGHTS['territory'] * territory_diff +
-            GoHeuristic.WEIGHTS['liberties'] * liberty_diff +
-            GoHeuristic.WEIGHTS['center_control'] * center_diff +
-            GoHeuristic.WEIGHTS['group_strength'] * group_strength_diff
-        )
+        return [stone_diff, territory_diff, liberty_diff, center_diff, group_strength_diff,
+                tactics_diff]
+    
+    @staticmethod
+    def _cachedFeatures(board, player_color):
+        cache = GoHeuristic._cache
+        if GoHeuristic.SHARE_COLOURS:
+            key = board.getHash()
+        else:
+            key = (board.getHash(), player_color)
         
-        return score
+        features = cache.get(key)
+        if features is None:
+            GoHeuristic.cache_misses += 1
+            color = GoBoard.BLACK if GoHeuristic.SHARE_COLOURS else player_color
+            features = cache[key] = GoHeuristic.getFeatures(board, color)
+            if len(cache) > GoHeuristic.CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            GoHeuristic.cache_hits += 1
+            cache.move_to_end(key)
+        
+        if GoHeuristic.SHARE_COLOURS and player_color != GoBoard.BLACK:
+            return [-value for value in features]
+        return features
+    
+    @staticmethod
+    def configureCache(max_entries=None, share_colours=None):
+        """Resize the evaluation cache (0 disables it) and/or switch colour sharing"""
+        if max_entries is not None:
+            GoHeuristic.CACHE_SIZE = max_entries
+        if share_colours is not None:
+            GoHeuristic.SHARE_COLOURS = share_colours
+        GoHeuristic.clearCache()
+    
+    @staticmethod
+    def clearCache():
+        GoHeuristic._cache.clear()
+        GoHeuristic.cache_hits = 0
+        GoHeuristic.cache_misses = 0
+    
+    @staticmethod
+    def getCacheStats():
+        return {
+            'entries': len(GoHeuristic._cache),
+            'max_entries': GoHeuristic.CACHE_SIZE,
+            'share_colours': GoHeuristic.SHARE_COLOURS,
+            'hits': GoHeuristic.cache_hits,
+            'misses': GoHeuristic.cache_misses,
+        }
+    
+    @staticmethod
+    def loadWeights(path):
+        with open(path) as f:
+            data = json.load(f)
+        
+        weights = data.get('weights', data)
+        unknown = set(weights) - set(GoHeuristic.FEATURES)
+        if unknown:
+            raise ValueError(f"{path}: unknown heuristic terms {sorted(unknown)}")
+        
+        GoHeuristic.WEIGHTS.update({name: float(value) for name, value in weights.items()})
+        return GoHeuristic.WEIGHTS
     
     @staticmethod
     def _stoneCountDiff(board, player, opponent):
@@ -41,8 +129,10 @@ class GoHeuristic:
     
     @staticmethod
     def _territoryDiff(board, player, opponent):
-        player_territory = board.getTerritoryScore(player)
-        opponent_territory = board.getTerritoryScore(opponent)
+        # Settled (Benson-alive) areas are scored as final, dead stones included
+        ownership = BensonLife.getOwnership(board)
+        player_territory = sum(row.count(player) for row in ownership)
+        opponent_territory = sum(row.count(opponent) for row in ownership)
         return player_territory - opponent_territory
     
     @staticmethod
@@ -85,6 +175,12 @@ class GoHeuristic:
         opponent_strength = GoHeuristic._calculateGroupStrength(board, opponent)
         return (player_strength - opponent_strength) / 10.0  # Normalize
     
+    @staticmethod
+    def _tacticsDiff(board, player, opponent):
+        # Stones lost to a ladder or atari chase whoever moves first; reading
+        # does not depend on the side to move, so the term stays antisymmetric
+        return TacticalReader.getDeadStones(board, opponent) - TacticalReader.getDeadStones(board, player)
+    
     @staticmethod
     def _calculateGroupStrength(board, color):
         """Calculate total strength of all groups"""
@@ -107,3 +203,6 @@ class GoHeuristic:
                     total_strength += strength
         
         return total_strength
+
+if os.environ.get(GoHeuristic.WEIGHTS_ENV):
+    GoHeuristic.loadWeights(os.environ[GoHeuristic.WEIGHTS_ENV])
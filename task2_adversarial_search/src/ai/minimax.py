@@ -1,116 +1,407 @@
 import time
 from ..game.board import GoBoard
+from ..game.benson import BensonLife
+from ..game.game_state import GameState
+from ..game.symmetry import BoardSymmetry
 from .heuristic import GoHeuristic
+from .patterns import PatternTable
+from .position_cache import PositionCache
+from .tactics import TacticalReader
+from .transposition import EXACT, LOWER, UPPER, TranspositionTable
 
 class MinimaxAI:
-    def __init__(self, color, depth=3, time_limit=5.0):
+    
+    PROGRESS_INTERVAL = 0.25  # Seconds between heartbeat progress events
+    
+    # Selective search
+    NULL_MOVE_REDUCTION = 2  # Extra plies skipped when searching after a pass
+    LMR_FULL_MOVES = 3       # Moves searched at full depth before reducing
+    LMR_MIN_DEPTH = 3        # Remaining depth needed to reduce a move
+    NULL_WINDOW = 1e-6       # Width of the zero windows used to test a bound
+    
+    # Two passes end the game: the area score decides it, above any heuristic value
+    FINAL_SCORE = 1000.0
+    
+    def __init__(self, color, depth=3, time_limit=5.0, pattern_table=None,
+                 transposition_table=None, position_cache=None,
+                 null_move=False, late_move_reductions=False):
         self.color = color
         self.depth = depth
         self.time_limit = time_limit
+        # Selective search switches (off: plain full-width alpha-beta).
+        # Null-move pruning: if passing still fails high, skip the node
+        self.null_move = null_move
+        # Search late-ordered moves one ply shallower unless they beat alpha
+        self.late_move_reductions = late_move_reductions
+        self.search_counters = dict.fromkeys(
+            ('null_move_tries', 'null_move_cutoffs', 'lmr_reductions', 'lmr_researches'), 0)
+        # 3x3 shape priors for move ordering ($GO_PATTERNS when not given)
+        self.pattern_table = pattern_table or PatternTable.getDefault()
+        # Search results; may be shared by AIs of both colours
+        if transposition_table is None:
+            transposition_table = TranspositionTable()
+        self.transposition_table = transposition_table
+        # On-disk results shared across runs and processes ($GO_CACHE when
+        # not given): a fresh table starts warm from it
+        if position_cache is None:
+            position_cache = PositionCache.getDefault()
+        self.position_cache = position_cache
+        if position_cache is not None and not len(self.transposition_table):
+            self.position_cache.loadInto(self.transposition_table)
+        # Komi used to score games that end by two passes in the search, and
+        # playouts behind the dead stones of a game ended by passing back
+        self.komi = GameState.KOMI
+        self.final_playouts = GameState.PLAYOUTS
+        self.pass_estimate = None  # (key, ownership estimate) of the last such root
+        self.search_aborted = False
+        # Optional callable; a true result aborts the search like a timeout
+        self.stop_check = None
+        # Optional callable receiving progress dicts (depth, best move, score,
+        # nodes per second, PV); it must be cheap and thread/process safe
+        self.progress_callback = None
         self.nodes_explored = 0
         self.start_time = 0
+        self.best_score = None
+        self.best_move = None
+        self.principal_variation = []
+        self.pv_table = {}
+        self.last_progress = 0
+        self.root_progress = (0, 0)
         
-    def getBestMove(self, board):       
+    def getBestMove(self, board, pass_count=0):
+        """Best move for self.color, or None to pass; pass_count is the
+        number of passes just played (GameState.pass_count)"""
         self.nodes_explored = 0
         self.start_time = time.time()
+        self.best_score = None
+        self.best_move = None
+        self.principal_variation = []
+        self.pv_table = {}
+        self.last_progress = self.start_time
+        self.root_progress = (0, 0)
+        self.search_aborted = False
+        self.search_counters = dict.fromkeys(self.search_counters, 0)
         
-        legal_moves = board.getLegalMoves(self.color)
+        legal_moves = self._candidateMoves(board, self.color)
         
-        if not legal_moves:
-            return None
-        
-        # If only one move, return it immediately
+        # If only one move (possibly just passing), return it immediately
         if len(legal_moves) == 1:
             return legal_moves[0]
         
+        # Passing back ends the game: score that with GameState's playout
+        # ownership of this board, estimated before the search clock starts
+        # so the moves keep their full time. Other game ends are scored
+        # without playouts, so that stored results depend only on their key;
+        # the root result, which does depend on the estimate, is neither
+        # taken from nor written to the table
+        estimate = None
+        if pass_count >= 1 and None in legal_moves:
+            estimate = self._passEstimate(board)
+            self.start_time = self.last_progress = time.time()
+        
+        # A stored result at least as deep answers the search outright
+        key, symmetry = TranspositionTable.positionKey(board, self.color, pass_count, self.komi)
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            stored_move = BoardSymmetry.fromCanonicalMove(entry[3], symmetry, board.size)
+            if (entry[0] >= self.depth and entry[2] == EXACT and stored_move in legal_moves and
+                    estimate is None):
+                self.best_score = entry[1]
+                self.best_move = stored_move
+                self.principal_variation = [stored_move]
+                return stored_move
+            legal_moves = self._tryFirst(legal_moves, stored_move)
+        if estimate is not None:
+            # Costs no search, and bounds the rest if time runs out
+            legal_moves = [None] + [move for move in legal_moves if move is not None]
+        
         best_move = None
         best_score = float('-inf')
         alpha = float('-inf')
         beta = float('inf')
         
         # Try each legal move
-        for move in legal_moves:
+        for index, move in enumerate(legal_moves):
             # Check time limit
-            if time.time() - self.start_time > self.time_limit:
+            if self._outOfTime():
                 break
+            self.root_progress = (index + 1, len(legal_moves))
             
             # Make move on copy of board
-            new_board = board.copy()
-            new_board.placeStone(move[0], move[1], self.color)
+            new_board, passes = self._playMove(board, move, self.color, pass_count)
             
-            # Get score for this move
-            score = self._minimax(
-                new_board,
-                self.depth - 1,
-                False,  # Next level is minimizing
-                alpha,
-                beta
-            )
+            # Get score for this move (next level is minimizing)
+            if passes >= 2:
+                score = self._finalScore(new_board, estimate)
+            elif self._reduceMove(index, self.depth, alpha):
+                self.search_counters['lmr_reductions'] += 1
+                score = self._minimax(new_board, self.depth - 2, False, alpha, alpha + self.NULL_WINDOW,
+                                      passes=passes)
+                if score > alpha:
+                    self.search_counters['lmr_researches'] += 1
+                    score = self._minimax(new_board, self.depth - 1, False, alpha, beta, passes=passes)
+            else:
+                score = self._minimax(new_board, self.depth - 1, False, alpha, beta, passes=passes)
             
             # Update best move
             if score > best_score:
                 best_score = score
                 best_move = move
+                self.best_score = best_score
+                self.best_move = best_move
+                self.principal_variation = [move] + self.pv_table.get(1, [])
             
             alpha = max(alpha, best_score)
+            self._publishProgress()
         
+        self.best_score = best_score if best_score != float('-inf') else None
+        if self.best_score is not None and not self.search_aborted and estimate is None:
+            self.transposition_table.store(
+                key, self.depth, best_score, EXACT,
+                BoardSymmetry.toCanonicalMove(best_move, symmetry, board.size))
+        self._saveResults()
         return best_move
     
-    def _minimax(self, board, depth, is_maximizing, alpha, beta):
+    def _minimax(self, board, depth, is_maximizing, alpha, beta, ply=1, allow_null=True, passes=0):
         self.nodes_explored += 1
+        self.pv_table[ply] = []
+        
+        if self.progress_callback and self.nodes_explored % 256 == 0:
+            if time.time() - self.last_progress >= self.PROGRESS_INTERVAL:
+                self._publishProgress()
+        
+        # Game over: both sides passed (also the only way out of a full board)
+        if passes >= 2:
+            return self._finalScore(board)
         
         # Check time limit
-        if time.time() - self.start_time > self.time_limit:
+        if self._outOfTime():
             return GoHeuristic.evaluate(board, self.color)
         
-        # Base case: reached depth limit or game over
-        if depth == 0 or board.isGameOver():
+        # Base case: reached depth limit
+        if depth == 0:
             return GoHeuristic.evaluate(board, self.color)
         
         current_player = self.color if is_maximizing else self._opponentColor()
-        legal_moves = board.getLegalMoves(current_player)
         
-        # No legal moves available
-        if not legal_moves:
-            return GoHeuristic.evaluate(board, self.color)
+        # Transposition table: scores are stored from the mover's side
+        key, symmetry = TranspositionTable.positionKey(board, current_player, passes, self.komi)
+        entry = self.transposition_table.probe(key)
+        stored_move = None
+        if entry is not None:
+            entry_depth, entry_score, bound, canonical_move = entry
+            stored_move = BoardSymmetry.fromCanonicalMove(canonical_move, symmetry, board.size)
+            if entry_depth >= depth:
+                score = entry_score if is_maximizing else -entry_score
+                if not is_maximizing and bound != EXACT:
+                    bound = LOWER if bound == UPPER else UPPER
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                elif bound == UPPER:
+                    beta = min(beta, score)
+                if bound == EXACT or alpha >= beta:
+                    self.pv_table[ply] = [stored_move] if stored_move else []
+                    return score
+        
+        # Null move: let the side to move pass and search the reply with a
+        # reduced depth; failing high even so means the node is not worth it.
+        # Not after a real pass, where passing again would end the game
+        null_depth = depth - 1 - self.NULL_MOVE_REDUCTION
+        if self.null_move and allow_null and null_depth >= 0 and passes == 0:
+            bound = beta if is_maximizing else alpha
+            if bound not in (float('inf'), float('-inf')):
+                self.search_counters['null_move_tries'] += 1
+                # A pass lifts the ko ban for the opponent's reply
+                null_board = board
+                if board.ko_point is not None:
+                    null_board = board.copy()
+                    null_board.ko_point = None
+                if is_maximizing:
+                    score = self._minimax(null_board, null_depth, False, beta - self.NULL_WINDOW, beta,
+                                          ply + 1, allow_null=False, passes=passes + 1)
+                    cutoff = score >= beta
+                else:
+                    score = self._minimax(null_board, null_depth, True, alpha, alpha + self.NULL_WINDOW,
+                                          ply + 1, allow_null=False, passes=passes + 1)
+                    cutoff = score <= alpha
+                if cutoff and not self.search_aborted:
+                    self.search_counters['null_move_cutoffs'] += 1
+                    return score
+        
+        alpha_original, beta_original = alpha, beta
+        legal_moves = self._tryFirst(self._candidateMoves(board, current_player), stored_move)
+        best_move = None
         
         if is_maximizing:
             max_score = float('-inf')
             
-            for move in legal_moves:
+            for index, move in enumerate(legal_moves):
                 # Make move
-                new_board = board.copy()
-                new_board.placeStone(move[0], move[1], current_player)
+                new_board, child_passes = self._playMove(board, move, current_player, passes)
                 
-                # Recurse
-                score = self._minimax(new_board, depth - 1, False, alpha, beta)
-                max_score = max(max_score, score)
+                # Recurse (late moves first with a reduced zero-window search)
+                if self._reduceMove(index, depth, alpha):
+                    self.search_counters['lmr_reductions'] += 1
+                    score = self._minimax(new_board, depth - 2, False, alpha, alpha + self.NULL_WINDOW,
+                                          ply + 1, passes=child_passes)
+                    if score > alpha:
+                        self.search_counters['lmr_researches'] += 1
+                        score = self._minimax(new_board, depth - 1, False, alpha, beta, ply + 1,
+                                              passes=child_passes)
+                else:
+                    score = self._minimax(new_board, depth - 1, False, alpha, beta, ply + 1,
+                                          passes=child_passes)
+                if score > max_score:
+                    max_score = score
+                    best_move = move
+                    self.pv_table[ply] = [move] + self.pv_table.get(ply + 1, [])
                 alpha = max(alpha, score)
                 
                 # Alpha-beta pruning
                 if beta <= alpha:
                     break
             
-            return max_score
+            best_score = max_score
         
         else:  # Minimizing
             min_score = float('inf')
             
-            for move in legal_moves:
+            for index, move in enumerate(legal_moves):
                 # Make move
-                new_board = board.copy()
-                new_board.placeStone(move[0], move[1], current_player)
+                new_board, child_passes = self._playMove(board, move, current_player, passes)
                 
-                # Recurse
-                score = self._minimax(new_board, depth - 1, True, alpha, beta)
-                min_score = min(min_score, score)
+                # Recurse (late moves first with a reduced zero-window search)
+                if self._reduceMove(index, depth, beta):
+                    self.search_counters['lmr_reductions'] += 1
+                    score = self._minimax(new_board, depth - 2, True, beta - self.NULL_WINDOW, beta,
+                                          ply + 1, passes=child_passes)
+                    if score < beta:
+                        self.search_counters['lmr_researches'] += 1
+                        score = self._minimax(new_board, depth - 1, True, alpha, beta, ply + 1,
+                                              passes=child_passes)
+                else:
+                    score = self._minimax(new_board, depth - 1, True, alpha, beta, ply + 1,
+                                          passes=child_passes)
+                if score < min_score:
+                    min_score = score
+                    best_move = move
+                    self.pv_table[ply] = [move] + self.pv_table.get(ply + 1, [])
                 beta = min(beta, score)
                 
                 # Alpha-beta pruning
                 if beta <= alpha:
                     break
             
-            return min_score
+            best_score = min_score
+        
+        # Results cut short by the clock are not worth keeping
+        if not self.search_aborted:
+            if best_score <= alpha_original:
+                bound = UPPER
+            elif best_score >= beta_original:
+                bound = LOWER
+            else:
+                bound = EXACT
+            stored_score = best_score
+            if not is_maximizing:
+                stored_score = -best_score
+                if bound != EXACT:
+                    bound = LOWER if bound == UPPER else UPPER
+            self.transposition_table.store(
+                key, depth, stored_score, bound,
+                BoardSymmetry.toCanonicalMove(best_move, symmetry, board.size))
+        
+        return best_score
+    
+    def _playMove(self, board, move, color, passes):
+        # Returns (board after move, passes in a row); a pass (None) leaves
+        # the board as it is, like GameState.passTurn
+        if move is None:
+            return board, passes + 1
+        new_board = board.copy()
+        new_board.placeStone(move[0], move[1], color)
+        return new_board, 0
+    
+    def _finalScore(self, board, estimate=None):
+        # GameState scoring of a finished game, from self.color's side
+        black_score, white_score, _ = GameState.scoreBoard(board, self.komi, estimate)
+        margin = black_score - white_score
+        if self.color == GoBoard.WHITE:
+            margin = -margin
+        return (self.FINAL_SCORE if margin > 0 else -self.FINAL_SCORE) + margin
+    
+    def _passEstimate(self, board):
+        # Cached: GTP and the UI may search the same position again
+        key = (board.getHash(), self.final_playouts)
+        if self.pass_estimate is None or self.pass_estimate[0] != key:
+            self.pass_estimate = (key, GameState.estimateOwnership(board, self.final_playouts))
+        return self.pass_estimate[1]
+    
+    def _reduceMove(self, index, depth, bound):
+        # bound: alpha (maximizing) or beta (minimizing) the move has to beat
+        return (self.late_move_reductions and index >= self.LMR_FULL_MOVES and
+                depth >= self.LMR_MIN_DEPTH and bound not in (float('inf'), float('-inf')))
+    
+    def _tryFirst(self, moves, move):
+        if move is None or move not in moves:
+            return moves
+        return [move] + [m for m in moves if m != move]
+    
+    def _saveResults(self):
+        # Persist what this search added to the transposition table
+        if self.position_cache is not None:
+            self.position_cache.save(self.transposition_table.takeDirty())
+    
+    def _publishProgress(self):
+        if not self.progress_callback:
+            return
+        
+        now = time.time()
+        self.last_progress = now
+        elapsed = now - self.start_time
+        self.progress_callback({
+            'depth': self.depth,
+            'root_move': self.root_progress[0],
+            'root_moves': self.root_progress[1],
+            'best_move': self.best_move,
+            'score': self.best_score,
+            'nodes': self.nodes_explored,
+            'nps': self.nodes_explored / elapsed if elapsed > 0 else 0.0,
+            'elapsed': elapsed,
+            'pv': list(self.principal_variation),
+        })
+    
+    def _outOfTime(self):
+        if time.time() - self.start_time > self.time_limit or (
+                self.stop_check is not None and self.stop_check()):
+            self.search_aborted = True
+            return True
+        return False
+    
+    def _candidateMoves(self, board, color):
+        # Points inside unconditionally settled areas cannot change the
+        # result, and filling an own true eye never helps
+        skip = set(BensonLife.getSettledOwnership(board))
+        for row in range(board.size):
+            for col in range(board.size):
+                if board.isEye(row, col, color):
+                    skip.add((row, col))
+        moves = board.getLegalMoves(color, skip=skip)
+        
+        # On a symmetric board, mirror-image moves lead to equivalent positions
+        moves = BoardSymmetry.uniqueMoves(board, moves)
+        
+        # Try likely shapes first so alpha-beta cuts off earlier
+        if self.pattern_table:
+            moves = self.pattern_table.orderMoves(board, moves, color)
+        
+        # Ladder/atari captures and rescues ahead of everything else
+        urgent = [move for move in TacticalReader.getUrgentMoves(board, color) if move in moves]
+        if urgent:
+            moves = urgent + [move for move in moves if move not in urgent]
+        
+        # Passing is always possible; searched last
+        return moves + [None]
     
     def _opponentColor(self):
         return GoBoard.WHITE if self.color == GoBoard.BLACK else GoBoard.BLACK
@@ -118,6 +409,15 @@ class MinimaxAI:
     def getStats(self):
         return {
             'nodes_explored': self.nodes_explored,
+            'best_score': self.best_score,
+            'pv': list(self.principal_variation),
             'depth': self.depth,
-            'time_limit': self.time_limit
+            'time_limit': self.time_limit,
+            'tt_entries': len(self.transposition_table),
+            'tt_hits': self.transposition_table.hits,
+            'null_move': self.null_move,
+            'late_move_reductions': self.late_move_reductions,
+            'eval_cache_hits': GoHeuristic.cache_hits,
+            'eval_cache_misses': GoHeuristic.cache_misses,
+            **self.search_counters,
         }
@@ -0,0 +1,266 @@
+"""3x3 pattern move priors.
+
+Every point's 3x3 neighbourhood is a 16-bit key (2 bits per neighbour:
+empty, black, white or off-board) that GoBoard keeps up to date as stones
+are placed and captured. Keys are normalised to the side to move and looked
+up in a table of priors: how often a move with that shape was actually
+played when it was available. Tables are built offline from SGF game records
+(``python main.py --build-patterns games/*.sgf -o patterns.bin``) and stored
+as a compact binary file.
+"""
+
+import argparse
+import array
+import os
+import random
+import re
+import struct
+import sys
+from ..game.board import GoBoard, PATTERN_OFFSETS, PATTERN_OFF_BOARD
+
+class PatternTable:
+
+    MAGIC = b'GOP3'
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct('<4sHIf')  # magic, version, entry count, default prior
+
+    PRIOR_STRENGTH = 2.0  # Pseudo-observations pulling rare patterns to the default
+    ENV_PATH = 'GO_PATTERNS'
+
+    LOW_BITS = 0x5555  # Low bit of every 2-bit neighbour field
+
+    _default = None
+    _default_loaded = False
+
+    def __init__(self, priors=None, default_prior=0.0):
+        self.priors = priors or {}
+        self.default_prior = default_prior
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def computeKey(board, row, col):
+        # Reference (non-incremental) encoding; GoBoard.getPatternKey is the fast path
+        key = 0
+        for slot, (dr, dc) in enumerate(PATTERN_OFFSETS):
+            stone = board.getStone(row + dr, col + dc)
+            value = PATTERN_OFF_BOARD if stone is None else stone
+            key |= value << (2 * slot)
+        return key
+
+    @staticmethod
+    def swapColors(key):
+        # Swap black (01) and white (10) fields; empty and off-board are unchanged
+        low = key & PatternTable.LOW_BITS
+        high = (key >> 1) & PatternTable.LOW_BITS
+        mixed = low ^ high
+        return key ^ (mixed | (mixed << 1))
+
+    @staticmethod
+    def normalizeKey(key, color):
+        # Tables are stored from Black's point of view
+        return key if color == GoBoard.BLACK else PatternTable.swapColors(key)
+
+    # ------------------------------------------------------------------
+    # Priors
+    # ------------------------------------------------------------------
+
+    def getPrior(self, board, row, col, color):
+        key = self.normalizeKey(board.getPatternKey(row, col), color)
+        return self.priors.get(key, self.default_prior)
+
+    def orderMoves(self, board, moves, color):
+        return sorted(moves, key=lambda move: -self.getPrior(board, move[0], move[1], color))
+
+    def sampleMove(self, board, moves, color, rng=random):
+        # Prior-weighted choice for fast playouts
+        if not moves:
+            return None
+        weights = [self.getPrior(board, row, col, color) for row, col in moves]
+        if sum(weights) <= 0:
+            return rng.choice(moves)
+        return rng.choices(moves, weights=weights)[0]
+
+    # ------------------------------------------------------------------
+    # Binary file
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        keys = array.array('H', sorted(self.priors))
+        priors = array.array('f', (self.priors[key] for key in keys))
+        if sys.byteorder != 'little':
+            keys.byteswap()
+            priors.byteswap()
+
+        with open(path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, len(keys), self.default_prior))
+            f.write(keys.tobytes())
+            f.write(priors.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"{path}: truncated pattern table")
+        magic, version, count, default_prior = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.FORMAT_VERSION:
+            raise ValueError(f"{path}: not a pattern table (version {cls.FORMAT_VERSION})")
+
+        keys = array.array('H')
+        priors = array.array('f')
+        offset = cls.HEADER.size
+        keys.frombytes(data[offset:offset + count * keys.itemsize])
+        offset += count * keys.itemsize
+        priors.frombytes(data[offset:offset + count * priors.itemsize])
+        if len(keys) != count or len(priors) != count:
+            raise ValueError(f"{path}: truncated pattern table")
+        if sys.byteorder != 'little':
+            keys.byteswap()
+            priors.byteswap()
+
+        return cls(dict(zip(keys, priors)), default_prior)
+
+    @classmethod
+    def getDefault(cls):
+        # Shared table named by $GO_PATTERNS, loaded once per process
+        if not cls._default_loaded:
+            cls._default_loaded = True
+            path = os.environ.get(cls.ENV_PATH)
+            if path:
+                cls._default = cls.load(path)
+        return cls._default
+
+    # ------------------------------------------------------------------
+    # Offline generation
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, games):
+        """Build priors from games given as (setup, moves) pairs.
+
+        setup is a list of (color, (row, col)); moves is a list of
+        (color, (row, col) or None for pass).
+        """
+        seen = {}
+        played = {}
+
+        for setup, moves in games:
+            board = GoBoard()
+            for color, (row, col) in setup:
+                board._setStone(row, col, color)
+
+            for color, move in moves:
+                if move is None:
+                    board.ko_point = None
+                    continue
+
+                legal_moves = board.getLegalMoves(color)
+                if move not in legal_moves:
+                    break  # Corrupt record; keep what was counted so far
+
+                for row, col in legal_moves:
+                    key = cls.normalizeKey(board.getPatternKey(row, col), color)
+                    seen[key] = seen.get(key, 0) + 1
+                key = cls.normalizeKey(board.getPatternKey(move[0], move[1]), color)
+                played[key] = played.get(key, 0) + 1
+
+                board.placeStone(move[0], move[1], color)
+
+        total_seen = sum(seen.values())
+        default_prior = sum(played.values()) / total_seen if total_seen else 0.0
+
+        priors = {}
+        for key, count in seen.items():
+            priors[key] = ((played.get(key, 0) + cls.PRIOR_STRENGTH * default_prior) /
+                           (count + cls.PRIOR_STRENGTH))
+
+        return cls(priors, default_prior)
+
+    @staticmethod
+    def parseSgf(text):
+        """Return (setup, moves) for the main line of a 9x9 SGF record"""
+        colors = {'B': GoBoard.BLACK, 'W': GoBoard.WHITE}
+        setup = []
+        moves = []
+
+        # Property values may contain brackets and parentheses, so tokenise
+        tokens = re.findall(r'\(|\)|;|[A-Za-z]+|\[(?:\\.|[^\\\]])*\]', text)
+
+        # stack[-1] is True once the current node list has entered its first
+        # variation; later sibling variations are skipped
+        stack = []
+        skip_depth = 0
+        prop = None
+
+        for token in tokens:
+            if skip_depth:
+                if token == '(':
+                    skip_depth += 1
+                elif token == ')':
+                    skip_depth -= 1
+                continue
+
+            if token == '(':
+                if stack and stack[-1]:
+                    skip_depth = 1
+                    continue
+                if stack:
+                    stack[-1] = True
+                stack.append(False)
+            elif token == ')':
+                if stack:
+                    stack.pop()
+                if not stack:
+                    break  # Only the first game of a collection
+            elif token == ';':
+                prop = None
+            elif token[0] == '[':
+                value = token[1:-1]
+                if prop == 'SZ' and value.strip() != str(GoBoard.BOARD_SIZE):
+                    raise ValueError(f"unsupported board size {value}")
+                if prop in ('AB', 'AW'):
+                    point = PatternTable._sgfPoint(value)
+                    if point is not None:
+                        setup.append((colors[prop[1]], point))
+                elif prop in colors:
+                    moves.append((colors[prop], PatternTable._sgfPoint(value)))
+            else:
+                prop = token
+
+        return setup, moves
+
+    @staticmethod
+    def _sgfPoint(value):
+        # 'aa' is the top-left corner; '' and 'tt' are passes
+        if len(value) != 2 or value == 'tt':
+            return None
+        col = ord(value[0]) - ord('a')
+        row = ord(value[1]) - ord('a')
+        if not (0 <= row < GoBoard.BOARD_SIZE and 0 <= col < GoBoard.BOARD_SIZE):
+            return None
+        return (row, col)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a 3x3 pattern prior table from SGF files")
+    parser.add_argument('games', nargs='+', help="9x9 SGF game records")
+    parser.add_argument('-o', '--output', default='patterns.bin')
+    args = parser.parse_args(argv)
+
+    games = []
+    for path in args.games:
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                games.append(PatternTable.parseSgf(f.read()))
+        except ValueError as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+
+    table = PatternTable.build(games)
+    table.save(args.output)
+    print(f"Wrote {len(table.priors)} patterns from {len(games)} games to {args.output}")
+
+if __name__ == "__main__":
+    main()
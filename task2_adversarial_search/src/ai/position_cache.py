@@ -0,0 +1,153 @@
+"""Persistent analysis cache shared by engine processes.
+
+Search results (TranspositionTable entries) are kept in an SQLite file so
+that a restarted engine starts warm. The database runs in WAL mode, which
+lets any number of worker processes read while one writes; every process
+opens its own connection and writes its new entries in one transaction
+after each search. Rows carry a "used" stamp, and when the table grows
+past max_entries the least recently written ones are evicted.
+
+Results depend on the evaluation, so the cache remembers the heuristic
+weights it was filled with and starts empty when they change.
+
+    GO_CACHE=analysis.db python main.py --gtp
+"""
+
+import json
+import os
+import sqlite3
+import time
+from ..game.board import GoBoard
+from .heuristic import GoHeuristic
+
+class PositionCache:
+
+    ENV_PATH = 'GO_CACHE'
+    FORMAT_VERSION = 3  # 2: final (komi) scores, passes and komi in keys; 3: no playout-scored results
+    MAX_ENTRIES = 1000000
+    LOAD_LIMIT = 100000  # Entries bulk loaded into a fresh table
+    BUSY_TIMEOUT = 10.0  # Seconds to wait for another process's write
+
+    _default = None
+    _default_loaded = False
+
+    def __init__(self, path, max_entries=None):
+        self.path = path
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.loaded = 0
+        self.saved = 0
+        self.evicted = 0
+        self.errors = 0
+
+        self.conn = sqlite3.connect(path, timeout=self.BUSY_TIMEOUT)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS positions ("
+                "key INTEGER PRIMARY KEY, depth INTEGER, score REAL, "
+                "bound INTEGER, move INTEGER, used REAL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS positions_used ON positions (used)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self._checkEvaluation()
+
+    @classmethod
+    def getDefault(cls):
+        # Shared cache named by $GO_CACHE, opened once per process
+        if not cls._default_loaded:
+            cls._default_loaded = True
+            path = os.environ.get(cls.ENV_PATH)
+            if path:
+                cls._default = cls(path)
+        return cls._default
+
+    def _checkEvaluation(self):
+        tag = json.dumps({'version': self.FORMAT_VERSION, 'weights': GoHeuristic.WEIGHTS},
+                         sort_keys=True)
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'evaluation'").fetchone()
+        if row is None or row[0] != tag:
+            self.conn.execute("DELETE FROM positions")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('evaluation', ?)", (tag,))
+
+    # Zobrist keys are unsigned 64-bit; SQLite integers are signed
+    @staticmethod
+    def _toSql(key):
+        return key - (1 << 64) if key >= (1 << 63) else key
+
+    @staticmethod
+    def _fromSql(key):
+        return key + (1 << 64) if key < 0 else key
+
+    @staticmethod
+    def _encodeMove(move):
+        return None if move is None else move[0] * GoBoard.BOARD_SIZE + move[1]
+
+    @staticmethod
+    def _decodeMove(value):
+        return None if value is None else divmod(value, GoBoard.BOARD_SIZE)
+
+    def loadInto(self, table, limit=None):
+        """Bulk load the most recently written entries into a TranspositionTable"""
+        limit = min(limit or self.LOAD_LIMIT, table.max_entries)
+        try:
+            rows = self.conn.execute(
+                "SELECT key, depth, score, bound, move FROM positions "
+                "ORDER BY used DESC LIMIT ?", (limit,)).fetchall()
+        except sqlite3.Error:
+            self.errors += 1
+            return 0
+
+        table.load((self._fromSql(key), depth, score, bound, self._decodeMove(move))
+                   for key, depth, score, bound, move in reversed(rows))
+        self.loaded += len(rows)
+        return len(rows)
+
+    def save(self, entries):
+        """Write (key, depth, score, bound, move) rows; deeper stored results win"""
+        if not entries:
+            return 0
+        now = time.time()
+        rows = [(self._toSql(key), depth, score, bound, self._encodeMove(move), now)
+                for key, depth, score, bound, move in entries]
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO positions VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET depth = excluded.depth, "
+                    "score = excluded.score, bound = excluded.bound, "
+                    "move = excluded.move, used = excluded.used "
+                    "WHERE excluded.depth >= positions.depth", rows)
+                self._evict()
+        except sqlite3.Error:
+            # Losing one batch only costs a re-search later
+            self.errors += 1
+            return 0
+
+        self.saved += len(rows)
+        return len(rows)
+
+    def _evict(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM positions WHERE key IN "
+                "(SELECT key FROM positions ORDER BY used LIMIT ?)", (excess,))
+            self.evicted += excess
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def getStats(self):
+        return {
+            'path': self.path,
+            'loaded': self.loaded,
+            'saved': self.saved,
+            'evicted': self.evicted,
+            'errors': self.errors,
+        }
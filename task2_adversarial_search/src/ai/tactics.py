@@ -0,0 +1,209 @@
+"""Narrow tactical reading: ladders and atari chases.
+
+Full-width minimax needs a dozen plies to see a ladder through. The reader
+only looks at strings with one or two liberties and only at the moves that
+matter for them: the attacker plays on a liberty (atari), the defender
+extends on a liberty or captures an adjacent attacker string in atari. A
+string that reaches three liberties has escaped. Results are cached per
+string (its smallest point) per position (Zobrist hash).
+"""
+
+from ..game.board import GoBoard
+
+UNKNOWN = 'unknown'  # Reading ran out of depth or nodes before deciding
+
+class TacticalReader:
+
+    MAX_DEPTH = 40      # Plies; long enough for a ladder across the board
+    MAX_NODES = 300     # Reading budget per query; exhausted means "no capture"
+    CACHE_SIZE = 50000
+
+    _cache = {}
+    _nodes = 0
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def canCapture(board, row, col):
+        """Move that captures the string at (row, col) with its opponent to move, or None"""
+        move = TacticalReader._cached(board, row, col, 'attack', TacticalReader._attack)
+        return None if move == UNKNOWN else move
+
+    @staticmethod
+    def canSave(board, row, col):
+        """Move that saves a threatened string with its owner to move, or None"""
+        move = TacticalReader._cached(board, row, col, 'defend', TacticalReader._defend)
+        return None if move == UNKNOWN else move
+
+    @staticmethod
+    def isDead(board, row, col):
+        # Capturable whoever moves first; independent of the side to move
+        group = board._getGroup(row, col)
+        if len(TacticalReader._liberties(board, group)) > 2:
+            return False
+        # Unfinished reading counts as alive on both sides
+        attack = TacticalReader._cached(board, row, col, 'attack', TacticalReader._attack)
+        if attack is None or attack == UNKNOWN:
+            return False
+        return TacticalReader._cached(board, row, col, 'defend', TacticalReader._defend) is None
+
+    @staticmethod
+    def getDeadStones(board, color):
+        """Number of color's stones in atari that cannot escape the chase"""
+        # Strings with two liberties are almost never dead with their owner
+        # to move, and reading them costs more than the rest of evaluate()
+        dead = 0
+        for group in TacticalReader._weakStrings(board, color, max_liberties=1):
+            if TacticalReader.isDead(board, *group[0]):
+                dead += len(group)
+        return dead
+
+    @staticmethod
+    def getUrgentMoves(board, color):
+        """Captures of opponent strings and rescues of own ones, biggest first"""
+        opponent = GoBoard.WHITE if color == GoBoard.BLACK else GoBoard.BLACK
+        urgent = []
+        for group in TacticalReader._weakStrings(board, opponent):
+            move = TacticalReader.canCapture(board, *group[0])
+            if move is not None:
+                urgent.append((len(group), move))
+        for group in TacticalReader._weakStrings(board, color):
+            if TacticalReader.canCapture(board, *group[0]) is not None:
+                move = TacticalReader.canSave(board, *group[0])
+                if move is not None:
+                    urgent.append((len(group), move))
+
+        moves = []
+        for _, move in sorted(urgent, key=lambda item: -item[0]):
+            if move not in moves:
+                moves.append(move)
+        return moves
+
+    @staticmethod
+    def clearCache():
+        TacticalReader._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cached(board, row, col, kind, read):
+        group = board._getGroup(row, col)
+        if not group:
+            return None
+        key = (board.getHash(), min(group), kind)
+        cache = TacticalReader._cache
+        if key in cache:
+            TacticalReader.hits += 1
+            return cache[key]
+
+        TacticalReader.misses += 1
+        TacticalReader._nodes = 0
+        move = read(board, min(group), TacticalReader.MAX_DEPTH)
+        if len(cache) >= TacticalReader.CACHE_SIZE:
+            cache.clear()
+        cache[key] = move
+        return move
+
+    @staticmethod
+    def _attack(board, point, depth):
+        # Attacker to move: a move after which the string cannot be saved,
+        # None if there is none, UNKNOWN if the budget ran out first
+        color = board.board[point[0]][point[1]]
+        attacker = GoBoard.WHITE if color == GoBoard.BLACK else GoBoard.BLACK
+        liberties = TacticalReader._liberties(board, board._getGroup(*point))
+
+        if len(liberties) == 1:
+            move = next(iter(liberties))
+            return move if board.copy().placeStone(move[0], move[1], attacker) else None
+        if len(liberties) > 2:
+            return None
+        if depth <= 0 or TacticalReader._nodes >= TacticalReader.MAX_NODES:
+            return UNKNOWN
+
+        result = None
+        for move in sorted(liberties):
+            TacticalReader._nodes += 1
+            next_board = board.copy()
+            if not next_board.placeStone(move[0], move[1], attacker):
+                continue
+            defence = TacticalReader._defend(next_board, point, depth - 1)
+            if defence is None:
+                return move
+            if defence == UNKNOWN:
+                result = UNKNOWN
+        return result
+
+    @staticmethod
+    def _defend(board, point, depth):
+        # Defender to move: a move that leaves the string uncapturable, None
+        # if there is none, UNKNOWN if the budget ran out first
+        color = board.board[point[0]][point[1]]
+        group = board._getGroup(*point)
+        liberties = TacticalReader._liberties(board, group)
+        if depth <= 0 or TacticalReader._nodes >= TacticalReader.MAX_NODES:
+            return UNKNOWN
+
+        # Extend on a liberty, or capture an attacker string in atari
+        candidates = sorted(liberties)
+        for r, c in TacticalReader._adjacentStrings(board, group):
+            attacker_liberties = TacticalReader._liberties(board, board._getGroup(r, c))
+            if len(attacker_liberties) == 1:
+                candidates.extend(attacker_liberties)
+
+        for move in candidates:
+            TacticalReader._nodes += 1
+            next_board = board.copy()
+            if not next_board.placeStone(move[0], move[1], color):
+                continue
+            new_liberties = TacticalReader._liberties(next_board, next_board._getGroup(*point))
+            if len(new_liberties) >= 3:
+                return move
+            # Unfinished reading means "no capture", so the move saves it
+            if len(new_liberties) == 2:
+                if TacticalReader._attack(next_board, point, depth - 1) in (None, UNKNOWN):
+                    return move
+        return None
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _liberties(board, group):
+        liberties = set()
+        for row, col in group:
+            for nr, nc in board.NEIGHBORS[row][col]:
+                if board.board[nr][nc] == GoBoard.EMPTY:
+                    liberties.add((nr, nc))
+        return liberties
+
+    @staticmethod
+    def _adjacentStrings(board, group):
+        # One stone of every opponent string touching group
+        color = board.board[group[0][0]][group[0][1]]
+        seen = set()
+        stones = []
+        for row, col in group:
+            for nr, nc in board.NEIGHBORS[row][col]:
+                neighbor = board.board[nr][nc]
+                if neighbor != GoBoard.EMPTY and neighbor != color and (nr, nc) not in seen:
+                    adjacent = board._getGroup(nr, nc)
+                    seen.update(adjacent)
+                    stones.append((nr, nc))
+        return stones
+
+    @staticmethod
+    def _weakStrings(board, color, max_liberties=2):
+        # Strings of color with at most max_liberties liberties
+        visited = set()
+        strings = []
+        for row in range(board.size):
+            for col in range(board.size):
+                if board.board[row][col] == color and (row, col) not in visited:
+                    group = board._getGroup(row, col)
+                    visited.update(group)
+                    if len(TacticalReader._liberties(board, group)) <= max_liberties:
+                        strings.append(group)
+        return strings
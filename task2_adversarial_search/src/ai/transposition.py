@@ -0,0 +1,104 @@
+"""Transposition table for MinimaxAI.
+
+Entries are keyed by the symmetry-canonical position key, the side to
+move, whether the last move was a pass and the komi, and hold (depth, score, bound,
+move). Scores are stored from the point of view of the side to move and
+moves in the canonical frame, so one entry serves the position in all 8
+orientations and for either AI colour (GoHeuristic.evaluate and final
+scores are antisymmetric). Entries added or deepened
+since the last takeDirty() call are tracked for PositionCache.
+"""
+
+from ..game.board import GoBoard
+from ..game.game_state import GameState
+from ..game.symmetry import BoardSymmetry
+
+# Bound types: the stored score is exact, a lower bound or an upper bound
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+WHITE_TO_MOVE = 0x2D358DCCAA6C78A5  # Mixed into the key when White is to move
+ONE_PASS = 0x8F14E45FCEEA167A       # Mixed in after a pass: another one ends the game
+KOMI_STEP = 0x9E3779B97F4A7C15      # Times half-points of komi away from the default
+
+class TranspositionTable:
+
+    MAX_ENTRIES = 100000
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.entries = {}
+        self.dirty = set()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def positionKey(board, color, passes=0, komi=GameState.KOMI):
+        """Return (key, symmetry) of board with color to move after passes passes"""
+        key, symmetry = BoardSymmetry.canonicalize(board)
+        if color == GoBoard.WHITE:
+            key ^= WHITE_TO_MOVE
+        if passes:
+            key ^= ONE_PASS
+        # Games ending in the search are scored with komi
+        half_points = round((komi - GameState.KOMI) * 2)
+        if half_points:
+            key ^= (KOMI_STEP * half_points) & 0xFFFFFFFFFFFFFFFF
+        return key, symmetry
+
+    def probe(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key, depth, score, bound, move):
+        # Keep the deeper result; equal depth replaces (newer bounds are tighter)
+        old = self.entries.pop(key, None)
+        if old is not None and old[0] > depth:
+            self.entries[key] = old
+            return
+
+        self.entries[key] = (depth, score, bound, move)
+        self.dirty.add(key)
+        self.stores += 1
+
+        # Dicts keep insertion order: drop the least recently stored entry
+        if len(self.entries) > self.max_entries:
+            oldest = next(iter(self.entries))
+            del self.entries[oldest]
+            self.dirty.discard(oldest)
+
+    def load(self, entries):
+        """Bulk insert (key, depth, score, bound, move) rows without marking them dirty"""
+        for key, depth, score, bound, move in entries:
+            old = self.entries.get(key)
+            if old is None or old[0] <= depth:
+                self.entries[key] = (depth, score, bound, move)
+            if len(self.entries) >= self.max_entries:
+                break
+
+    def takeDirty(self):
+        """Return and forget the entries changed since the previous call"""
+        rows = [(key,) + self.entries[key] for key in self.dirty if key in self.entries]
+        self.dirty.clear()
+        return rows
+
+    def clear(self):
+        self.entries.clear()
+        self.dirty.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def getStats(self):
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+        }
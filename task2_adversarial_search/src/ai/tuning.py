@@ -0,0 +1,144 @@
+"""Texel-style offline tuning of GoHeuristic.WEIGHTS.
+
+Labelled positions are JSON lines with a board and the game result from
+Black's point of view (1 = Black won, 0 = White won, 0.5 = jigo):
+
+    {"board": ["........."] * 9, "result": 1}
+
+Every heuristic term is computed once per position and kept as a NumPy
+feature matrix (optionally cached in an .npz file). The weights are then
+fitted so that sigmoid(k * evaluate) predicts the result, minimising the
+mean squared error with full-batch vectorised gradient descent:
+
+    python main.py --tune positions.jsonl --features features.npz -o weights.json
+
+Load the result with ``GO_WEIGHTS=weights.json`` or GoHeuristic.loadWeights.
+"""
+
+import argparse
+import json
+import os
+import sys
+from multiprocessing import Pool
+import numpy as np
+from ..game.board import GoBoard
+from .heuristic import GoHeuristic
+
+def _positionFeatures(line):
+    position = json.loads(line) if isinstance(line, str) else line
+    board = GoBoard.fromRows(position['board'], position.get('ko'))
+    return GoHeuristic.getFeatures(board, GoBoard.BLACK), float(position['result'])
+
+class TexelTuner:
+
+    LEARNING_RATE = 0.01
+    ITERATIONS = 2000
+    K_CANDIDATES = np.logspace(-4, 0, 81)
+
+    # Adam moment decay rates
+    BETA1 = 0.9
+    BETA2 = 0.999
+    EPSILON = 1e-8
+
+    def __init__(self, features, results):
+        self.features = np.asarray(features, dtype=np.float64)
+        self.results = np.asarray(results, dtype=np.float64)
+        self.k = None
+
+    @classmethod
+    def fromPositions(cls, positions, workers=None):
+        positions = [p for p in positions if not isinstance(p, str) or p.strip()]
+        if workers and workers > 1:
+            with Pool(workers) as pool:
+                rows = pool.map(_positionFeatures, positions, chunksize=256)
+        else:
+            rows = [_positionFeatures(p) for p in positions]
+
+        if not rows:
+            raise ValueError("no labelled positions")
+        features, results = zip(*rows)
+        return cls(features, results)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data['features'], data['results'])
+
+    def save(self, path):
+        np.savez_compressed(path, features=self.features, results=self.results)
+
+    @staticmethod
+    def weightVector(weights=None):
+        weights = weights or GoHeuristic.WEIGHTS
+        return np.array([weights[name] for name in GoHeuristic.FEATURES], dtype=np.float64)
+
+    def loss(self, weights, k):
+        predicted = 1.0 / (1.0 + np.exp(-k * (self.features @ weights)))
+        return float(np.mean((predicted - self.results) ** 2))
+
+    def fitScale(self, weights):
+        # Texel's k maps evaluation units to win probability; fix it before tuning
+        losses = [self.loss(weights, k) for k in self.K_CANDIDATES]
+        self.k = float(self.K_CANDIDATES[int(np.argmin(losses))])
+        return self.k
+
+    def fit(self, weights=None, iterations=None, learning_rate=None):
+        weights = self.weightVector() if weights is None else np.array(weights, dtype=np.float64)
+        iterations = iterations or self.ITERATIONS
+        learning_rate = learning_rate or self.LEARNING_RATE
+        k = self.k if self.k is not None else self.fitScale(weights)
+
+        X, y = self.features, self.results
+        m = np.zeros_like(weights)
+        v = np.zeros_like(weights)
+
+        for step in range(1, iterations + 1):
+            predicted = 1.0 / (1.0 + np.exp(-k * (X @ weights)))
+            error = predicted - y
+            gradient = (2.0 * k / len(y)) * (X.T @ (error * predicted * (1.0 - predicted)))
+
+            # Adam update: the terms have very different scales
+            m = self.BETA1 * m + (1 - self.BETA1) * gradient
+            v = self.BETA2 * v + (1 - self.BETA2) * gradient ** 2
+            m_hat = m / (1 - self.BETA1 ** step)
+            v_hat = v / (1 - self.BETA2 ** step)
+            weights = weights - learning_rate * m_hat / (np.sqrt(v_hat) + self.EPSILON)
+
+        return {name: float(value) for name, value in zip(GoHeuristic.FEATURES, weights)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune GoHeuristic weights on labelled positions")
+    parser.add_argument('positions', nargs='?', help="JSON lines of {board, result}")
+    parser.add_argument('--features', help="cache of the feature matrix (.npz)")
+    parser.add_argument('-o', '--output', default='weights.json')
+    parser.add_argument('--iterations', type=int, default=TexelTuner.ITERATIONS)
+    parser.add_argument('--learning-rate', type=float, default=TexelTuner.LEARNING_RATE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    if args.features and os.path.exists(args.features):
+        tuner = TexelTuner.load(args.features)
+    elif args.positions:
+        with open(args.positions) as f:
+            tuner = TexelTuner.fromPositions(f.readlines(), args.workers)
+        if args.features:
+            tuner.save(args.features)
+    else:
+        parser.error("positions file or existing --features cache required")
+
+    start_weights = TexelTuner.weightVector()
+    k = tuner.fitScale(start_weights)
+    start_loss = tuner.loss(start_weights, k)
+    weights = tuner.fit(start_weights, args.iterations, args.learning_rate)
+    final_loss = tuner.loss(TexelTuner.weightVector(weights), k)
+
+    with open(args.output, 'w') as f:
+        json.dump({'weights': weights, 'k': k, 'loss': final_loss,
+                   'positions': len(tuner.results)}, f, indent=2)
+
+    print(f"{len(tuner.results)} positions, k={k:.4g}, loss {start_loss:.5f} -> {final_loss:.5f}",
+          file=sys.stderr)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
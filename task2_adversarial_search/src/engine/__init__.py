@@ -0,0 +1,19 @@
+"""Headless engine front ends (no pygame imports)"""
+
+from .gtp import GtpEngine
+
+__all__ = ['GtpEngine', 'AnalysisService', 'AiProcess', 'GameServer']
+
+# Loaded on first use: they pull in asyncio, multiprocessing and sqlite3,
+# which would slow down GTP startup
+_LAZY = {
+    'AnalysisService': '.analysis',
+    'AiProcess': '.ai_process',
+    'GameServer': '.server',
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
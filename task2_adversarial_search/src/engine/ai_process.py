@@ -0,0 +1,190 @@
+"""Out-of-process AI backend.
+
+The search runs in one persistent worker process so it never competes with
+the UI thread for the GIL. The worker keeps its MinimaxAI instances (and
+their caches) alive between moves. Requests and results travel over a pipe;
+every request carries an id, and a shared "active request" value lets the
+parent cancel a running search without racing against the next request.
+While searching, the worker also streams MinimaxAI progress events back
+over the same pipe. The worker also runs the playouts that score a finished
+game, which would otherwise block the UI.
+"""
+
+import multiprocessing
+import time
+from ..ai.minimax import MinimaxAI
+from ..ai.transposition import TranspositionTable
+from ..game.game_state import GameState
+
+def _aiWorkerLoop(conn, active_request, depth, time_limit):
+    ais = {}
+    table = TranspositionTable()  # Shared by both colours
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        kind, request_id, *args = message
+        if active_request.value != request_id:
+            continue  # Cancelled before it started
+
+        if kind == 'ownership':
+            board, playouts = args
+            try:
+                conn.send(('result', request_id, GameState.estimateOwnership(board, playouts)))
+            except (BrokenPipeError, OSError):
+                break
+            continue
+
+        board, color, request_depth, request_time, pass_count = args
+        ai = ais.get(color)
+        if ai is None:
+            ai = MinimaxAI(color, depth=depth, time_limit=time_limit, transposition_table=table)
+            ais[color] = ai
+        ai.stop_check = lambda request_id=request_id: active_request.value != request_id
+        ai.progress_callback = lambda info, request_id=request_id: conn.send(('progress', request_id, info))
+        ai.depth = request_depth or depth
+        ai.time_limit = request_time or time_limit
+
+        start = time.time()
+        move = ai.getBestMove(board, pass_count=pass_count)
+        stats = ai.getStats()
+        stats['elapsed'] = time.time() - start
+        stats['cancelled'] = active_request.value != request_id
+
+        try:
+            conn.send(('result', request_id, move, stats))
+        except (BrokenPipeError, OSError):
+            break
+
+class AiProcess:
+
+    JOIN_TIMEOUT = 1.0
+    MAX_RETRIES = 3  # Restarts allowed while serving a single request
+
+    def __init__(self, color, depth=3, time_limit=5.0):
+        self.color = color
+        self.depth = depth
+        self.time_limit = time_limit
+
+        # spawn: never fork a process that has pygame/SDL initialised
+        self.context = multiprocessing.get_context('spawn')
+        self.process = None
+        self.conn = None
+        self.active_request = self.context.RawValue('i', 0)
+
+        self.next_request_id = 1
+        self.current_request = None
+        self.progress = None  # Latest progress event of the current request
+        self.retries = 0
+        self.restarts = 0
+
+    def start(self):
+        if self.process is not None and self.process.is_alive():
+            return self
+
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_aiWorkerLoop,
+            args=(child_conn, self.active_request, self.depth, self.time_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        return self
+
+    def isAlive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def requestMove(self, board, color=None, depth=None, time_limit=None, pass_count=0):
+        """Start searching board (pass_count passes just played); returns the request id"""
+        return self._request('move', board.copy(), color or self.color, depth, time_limit, pass_count)
+
+    def requestOwnership(self, board, playouts=GameState.PLAYOUTS):
+        """Start a GameState.estimateOwnership() of board; returns the request id"""
+        return self._request('ownership', board.copy(), playouts)
+
+    def _request(self, kind, *args):
+        self.start()
+        request_id = self.next_request_id
+        self.next_request_id += 1
+
+        self.current_request = (kind, request_id) + args
+        self.retries = 0
+        self.progress = None
+        self.active_request.value = request_id
+        self.conn.send(self.current_request)
+        return request_id
+
+    def poll(self):
+        """Return (move, stats) of a move request or (estimate,) of an
+        ownership request once it is done, else None"""
+        if self.current_request is None:
+            return None
+
+        try:
+            while self.conn.poll():
+                kind, request_id, *payload = self.conn.recv()
+                if request_id != self.current_request[1]:
+                    continue  # Stale message of a cancelled search
+                if kind == 'progress':
+                    self.progress = payload[0]
+                else:
+                    self.current_request = None
+                    return tuple(payload)
+        except (EOFError, OSError):
+            pass
+
+        if not self.isAlive():
+            # Worker crashed: restart it and resubmit the request
+            if self.retries >= self.MAX_RETRIES:
+                self.current_request = None
+                raise RuntimeError("AI worker process keeps crashing")
+            self.retries += 1
+            self.restart()
+            self.active_request.value = self.current_request[1]
+            self.conn.send(self.current_request)
+
+        return None
+
+    def isBusy(self):
+        return self.current_request is not None
+
+    def cancel(self):
+        # The worker notices within one node and moves on to the next request
+        self.active_request.value = 0
+        self.current_request = None
+        self.progress = None
+
+    def restart(self):
+        self._stop(graceful=False)
+        self.restarts += 1
+        return self.start()
+
+    def close(self):
+        self.cancel()
+        self._stop(graceful=True)
+
+    def _stop(self, graceful):
+        if self.process is None:
+            return
+
+        if graceful and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(self.JOIN_TIMEOUT)
+
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(self.JOIN_TIMEOUT)
+
+        self.conn.close()
+        self.process = None
+        self.conn = None
@@ -0,0 +1,214 @@
+"""Batch position analysis over a pool of warm engine processes.
+
+Run with ``python main.py --analyze [positions.jsonl]``. Positions are read
+as JSON lines:
+
+    {"id": 1, "board": ["........."] * 9, "to_move": "B", "ko": [r, c]}
+
+and every result is written back as one JSON line with the best move, its
+score and the search statistics. At most ``max_pending`` positions are in
+flight at any time, so reading from a fast producer blocks instead of
+queueing the whole input in memory.
+
+With ``--cache analysis.db`` every worker shares an on-disk PositionCache,
+so positions analysed by an earlier run are answered without searching.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from ..game.board import GoBoard
+from ..ai.minimax import MinimaxAI
+from ..ai.position_cache import PositionCache
+from ..ai.transposition import TranspositionTable
+
+# Per-process engine state, created once by _initWorker and reused for every
+# request the worker handles so that search caches stay warm.
+_worker_ais = {}
+_worker_config = {}
+
+def _initWorker(depth, time_limit, cache_path=None, search_options=None):
+    _worker_config['depth'] = depth
+    _worker_config['time_limit'] = time_limit
+    _worker_config['search_options'] = search_options or {}
+    _worker_config['cache'] = PositionCache(cache_path) if cache_path else None
+    _worker_config['table'] = TranspositionTable()
+    _worker_ais.clear()
+
+def _workerAI(color, depth, time_limit):
+    ai = _worker_ais.get(color)
+    if ai is None:
+        ai = MinimaxAI(color, depth=depth, time_limit=time_limit,
+                       transposition_table=_worker_config['table'],
+                       position_cache=_worker_config['cache'],
+                       **_worker_config['search_options'])
+        _worker_ais[color] = ai
+    ai.depth = depth
+    ai.time_limit = time_limit
+    return ai
+
+def _analyzePosition(request):
+    start = time.time()
+    board = GoBoard.fromRows(request['board'], request.get('ko'))
+    color = request['color']
+    depth = request.get('depth') or _worker_config['depth']
+    time_limit = request.get('time_limit') or _worker_config['time_limit']
+
+    ai = _workerAI(color, depth, time_limit)
+    move = ai.getBestMove(board, pass_count=request.get('pass_count', 0))
+    stats = ai.getStats()
+    stats['elapsed'] = time.time() - start
+    stats['worker'] = os.getpid()
+
+    return {
+        'id': request.get('id'),
+        'move': list(move) if move else None,
+        'score': ai.best_score,
+        'stats': stats,
+    }
+
+class AnalysisService:
+
+    COLORS = {'b': GoBoard.BLACK, 'black': GoBoard.BLACK,
+              'w': GoBoard.WHITE, 'white': GoBoard.WHITE}
+
+    def __init__(self, workers=None, max_pending=None, depth=3, time_limit=5.0, cache_path=None,
+                 search_options=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.depth = depth
+        self.time_limit = time_limit
+        self.cache_path = cache_path
+        # Extra MinimaxAI keyword arguments, e.g. {'null_move': True}
+        self.search_options = search_options or {}
+        self.executor = None
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_initWorker,
+                initargs=(self.depth, self.time_limit, self.cache_path, self.search_options),
+            )
+        return self
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def parseRequest(self, position):
+        if isinstance(position, str):
+            position = json.loads(position)
+        if not isinstance(position, dict):
+            raise ValueError("position must be a JSON object")
+
+        color = self.COLORS.get(str(position.get('to_move', 'b')).lower())
+        if color is None:
+            raise ValueError(f"invalid to_move {position.get('to_move')!r}")
+
+        # Validate here so bad input is reported without a round trip
+        GoBoard.fromRows(position['board'], position.get('ko'))
+
+        request = dict(position)
+        request['color'] = color
+        return request
+
+    def analyze(self, positions):
+        """Yield one result per position, in completion order"""
+        self.start()
+        pending = {}
+
+        for position in positions:
+            if isinstance(position, str) and not position.strip():
+                continue
+
+            try:
+                request = self.parseRequest(position)
+            except (ValueError, KeyError, TypeError) as e:
+                self.failed += 1
+                yield {'id': self._requestId(position), 'error': str(e)}
+                continue
+
+            # Backpressure: never hold more than max_pending positions
+            while len(pending) >= self.max_pending:
+                yield from self._collect(pending)
+
+            pending[self.executor.submit(_analyzePosition, request)] = request.get('id')
+            self.submitted += 1
+
+        while pending:
+            yield from self._collect(pending)
+
+    def _collect(self, pending):
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            request_id = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                self.failed += 1
+                yield {'id': request_id, 'error': str(e)}
+            else:
+                self.completed += 1
+                yield result
+
+    def _requestId(self, position):
+        if isinstance(position, dict):
+            return position.get('id')
+        try:
+            return json.loads(position).get('id')
+        except (ValueError, AttributeError):
+            return None
+
+    def getStats(self):
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse Go positions read as JSON lines")
+    parser.add_argument('input', nargs='?', help="JSON lines file (default: stdin)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-pending', type=int, default=None)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--time-limit', type=float, default=5.0)
+    parser.add_argument('--cache', help="persistent position cache (SQLite file)")
+    parser.add_argument('--null-move', action='store_true', help="enable null-move pruning")
+    parser.add_argument('--lmr', action='store_true', help="enable late move reductions")
+    args = parser.parse_args(argv)
+
+    infile = open(args.input) if args.input else sys.stdin
+    search_options = {'null_move': args.null_move, 'late_move_reductions': args.lmr}
+    service = AnalysisService(args.workers, args.max_pending, args.depth, args.time_limit,
+                              args.cache, search_options)
+    try:
+        with service:
+            for result in service.analyze(infile):
+                sys.stdout.write(json.dumps(result) + '\n')
+                sys.stdout.flush()
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+
+    print(json.dumps(service.getStats()), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
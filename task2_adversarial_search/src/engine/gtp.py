@@ -0,0 +1,303 @@
+"""Go Text Protocol (GTP v2) front end for the Minimax engine.
+
+Only the game and AI packages are imported here so that the engine can run
+headless and start quickly; pygame is never loaded on this path.
+"""
+
+import sys
+import time
+from ..game.board import GoBoard
+from ..game.game_state import GameState
+from ..ai.minimax import MinimaxAI
+from ..ai.transposition import TranspositionTable
+
+class GtpEngine:
+
+    NAME = "Final_AI Minimax"
+    VERSION = "1.0"
+    PROTOCOL_VERSION = "2"
+
+    # GTP column letters skip 'I'
+    COLUMNS = "ABCDEFGHJKLMNOPQRST"
+
+    # Time management
+    DEFAULT_MOVES_LEFT = 30  # Expected remaining moves when only main time is left
+    TIME_SAFETY = 0.8        # Fraction of the per-move budget actually used
+    MIN_TIME = 0.1
+
+    def __init__(self, depth=3, time_limit=5.0, komi=GameState.KOMI):
+        self.depth = depth
+        self.default_time_limit = time_limit
+        self.komi = komi
+        self.game_state = GameState(GameState.MODE_PVP, komi)
+        # Kept across genmove calls (and colours) so every search starts warm
+        self.transposition_table = TranspositionTable()
+
+        # time_settings / time_left state: {color: (seconds, stones)}
+        self.main_time = None
+        self.byo_yomi_time = 0
+        self.byo_yomi_stones = 0
+        self.time_left = {}
+
+        self.running = True
+        self.commands = {
+            'protocol_version': self._cmdProtocolVersion,
+            'name': self._cmdName,
+            'version': self._cmdVersion,
+            'known_command': self._cmdKnownCommand,
+            'list_commands': self._cmdListCommands,
+            'quit': self._cmdQuit,
+            'boardsize': self._cmdBoardsize,
+            'clear_board': self._cmdClearBoard,
+            'komi': self._cmdKomi,
+            'play': self._cmdPlay,
+            'genmove': self._cmdGenmove,
+            'time_settings': self._cmdTimeSettings,
+            'time_left': self._cmdTimeLeft,
+            'final_score': self._cmdFinalScore,
+            'final_status_list': self._cmdFinalStatusList,
+            'showboard': self._cmdShowboard,
+        }
+
+    def run(self, infile=None, outfile=None):
+        infile = infile or sys.stdin
+        outfile = outfile or sys.stdout
+
+        for line in infile:
+            response = self.handle(line)
+            if response is None:
+                continue
+            outfile.write(response)
+            outfile.flush()
+            if not self.running:
+                break
+
+    def handle(self, line):
+        # Strip comments and control characters as required by the spec
+        line = line.split('#', 1)[0].replace('\t', ' ')
+        line = ''.join(ch for ch in line if ch >= ' ').strip()
+        if not line:
+            return None
+
+        parts = line.split()
+        cmd_id = ''
+        if parts[0].isdigit():
+            cmd_id = parts.pop(0)
+            if not parts:
+                return None
+
+        name, args = parts[0].lower(), parts[1:]
+        handler = self.commands.get(name)
+        if handler is None:
+            return f"?{cmd_id} unknown command\n\n"
+
+        try:
+            result = handler(args)
+        except ValueError as e:
+            return f"?{cmd_id} {e}\n\n"
+
+        result = '' if result is None else result
+        return f"={cmd_id} {result}".rstrip(' ') + "\n\n"
+
+    # ------------------------------------------------------------------
+    # Coordinate conversion
+    # ------------------------------------------------------------------
+
+    def parseColor(self, text):
+        text = text.lower()
+        if text in ('b', 'black'):
+            return GoBoard.BLACK
+        if text in ('w', 'white'):
+            return GoBoard.WHITE
+        raise ValueError("invalid color")
+
+    def parseVertex(self, text):
+        text = text.upper()
+        if text == 'PASS':
+            return None
+
+        size = self.game_state.board.size
+        try:
+            col = self.COLUMNS.index(text[0])
+            number = int(text[1:])
+        except (IndexError, ValueError):
+            raise ValueError("invalid coordinate")
+
+        row = size - number
+        if not self.game_state.board.isValidPosition(row, col):
+            raise ValueError("invalid coordinate")
+        return (row, col)
+
+    def formatVertex(self, move):
+        if move is None:
+            return "pass"
+        row, col = move
+        return f"{self.COLUMNS[col]}{self.game_state.board.size - row}"
+
+    # ------------------------------------------------------------------
+    # Time management
+    # ------------------------------------------------------------------
+
+    def timeForMove(self, color):
+        if self.main_time is None:
+            return self.default_time_limit
+
+        seconds, stones = self.time_left.get(color, (self.main_time, 0))
+        if stones > 0:
+            # Inside a byo-yomi period
+            budget = seconds / stones
+        elif self.byo_yomi_stones > 0:
+            budget = seconds / self.DEFAULT_MOVES_LEFT + self.byo_yomi_time / self.byo_yomi_stones
+        else:
+            budget = seconds / self.DEFAULT_MOVES_LEFT
+
+        return max(self.MIN_TIME, min(self.default_time_limit, budget * self.TIME_SAFETY))
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def _cmdProtocolVersion(self, args):
+        return self.PROTOCOL_VERSION
+
+    def _cmdName(self, args):
+        return self.NAME
+
+    def _cmdVersion(self, args):
+        return self.VERSION
+
+    def _cmdKnownCommand(self, args):
+        if not args:
+            raise ValueError("syntax error")
+        return "true" if args[0].lower() in self.commands else "false"
+
+    def _cmdListCommands(self, args):
+        return '\n'.join(self.commands)
+
+    def _cmdQuit(self, args):
+        self.running = False
+
+    def _cmdBoardsize(self, args):
+        if not args or not args[0].isdigit():
+            raise ValueError("syntax error")
+        if int(args[0]) != GoBoard.BOARD_SIZE:
+            raise ValueError("unacceptable size")
+        self._cmdClearBoard(args)
+
+    def _cmdClearBoard(self, args):
+        self.game_state = GameState(GameState.MODE_PVP, self.komi)
+
+    def _cmdKomi(self, args):
+        try:
+            komi = float(args[0])
+        except (IndexError, ValueError):
+            raise ValueError("syntax error")
+        # Stored search results are scored with the old komi
+        if komi != self.komi:
+            self.transposition_table.clear()
+        self.komi = komi
+        self.game_state.komi = self.komi
+
+    def _cmdPlay(self, args):
+        if len(args) < 2:
+            raise ValueError("syntax error")
+        color = self.parseColor(args[0])
+        move = self.parseVertex(args[1])
+
+        previous_player = self.game_state.current_player
+        self.game_state.current_player = color
+        if move is None:
+            self.game_state.passTurn()
+        elif not self.game_state.makeMove(move[0], move[1]):
+            # A rejected move leaves the side to move as it was
+            self.game_state.current_player = previous_player
+            raise ValueError("illegal move")
+
+    def _cmdGenmove(self, args):
+        if not args:
+            raise ValueError("syntax error")
+        color = self.parseColor(args[0])
+
+        start = time.time()
+        ai = MinimaxAI(color, depth=self.depth, time_limit=self.timeForMove(color),
+                       transposition_table=self.transposition_table)
+        ai.komi = self.game_state.komi
+        move = ai.getBestMove(self.game_state.board, pass_count=self.game_state.pass_count)
+        self._chargeTime(color, time.time() - start)
+
+        self.game_state.current_player = color
+        if move is None or not self.game_state.makeMove(move[0], move[1]):
+            self.game_state.passTurn()
+            move = None
+
+        return self.formatVertex(move)
+
+    def _cmdTimeSettings(self, args):
+        try:
+            main_time, byo_yomi_time, byo_yomi_stones = (int(a) for a in args[:3])
+        except ValueError:
+            raise ValueError("syntax error")
+
+        # byo_yomi_time > 0 with byo_yomi_stones == 0 means no time limit
+        self.main_time = None if byo_yomi_time > 0 and byo_yomi_stones == 0 else main_time
+        self.byo_yomi_time = byo_yomi_time
+        self.byo_yomi_stones = byo_yomi_stones
+        self.time_left = {
+            GoBoard.BLACK: (main_time, 0),
+            GoBoard.WHITE: (main_time, 0),
+        }
+
+    def _cmdTimeLeft(self, args):
+        if len(args) < 3:
+            raise ValueError("syntax error")
+        color = self.parseColor(args[0])
+        try:
+            self.time_left[color] = (float(args[1]), int(args[2]))
+        except ValueError:
+            raise ValueError("syntax error")
+        if self.main_time is None:
+            self.main_time = 0
+
+    def _chargeTime(self, color, elapsed):
+        # Keep our own clock in case the controller never sends time_left
+        if self.main_time is None:
+            return
+        seconds, stones = self.time_left.get(color, (self.main_time, 0))
+        seconds -= elapsed
+        if stones > 0:
+            stones -= 1
+            if stones == 0:
+                seconds, stones = self.byo_yomi_time, self.byo_yomi_stones
+        elif seconds <= 0 and self.byo_yomi_stones > 0:
+            seconds, stones = self.byo_yomi_time, self.byo_yomi_stones
+        self.time_left[color] = (seconds, stones)
+
+    def _cmdFinalScore(self, args):
+        black_score, white_score = self.game_state.getScore()
+        if black_score > white_score:
+            return f"B+{black_score - white_score:g}"
+        if white_score > black_score:
+            return f"W+{white_score - black_score:g}"
+        return "0"
+
+    def _cmdFinalStatusList(self, args):
+        if not args or args[0].lower() not in ('alive', 'dead', 'seki'):
+            raise ValueError("syntax error")
+        status = args[0].lower()
+        if status == 'seki':
+            return ""  # Not detected; seki stones are reported alive
+
+        board = self.game_state.board
+        dead = set(self.game_state.getDeadStones())
+        stones = [(row, col) for row in range(board.size) for col in range(board.size)
+                  if board.board[row][col] != GoBoard.EMPTY and ((row, col) in dead) == (status == 'dead')]
+        return ' '.join(self.formatVertex(stone) for stone in stones)
+
+    def _cmdShowboard(self, args):
+        return '\n' + str(self.game_state.board)
+
+def main():
+    GtpEngine().run()
+
+if __name__ == "__main__":
+    main()
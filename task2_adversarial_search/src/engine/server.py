@@ -0,0 +1,428 @@
+"""Multi-session PvAI game server.
+
+Run with ``python main.py --serve [--port 8765] [--workers 4]``. Clients
+connect over TCP (localhost by default) and exchange JSON lines:
+
+    {"id": 1, "cmd": "new", "ai_color": "W", "time_budget": 120}
+    {"id": 2, "cmd": "play", "session": 1, "move": [4, 4]}    (null = pass)
+    {"id": 3, "cmd": "state", "session": 1}    (retries a failed AI move)
+    {"id": 4, "cmd": "close", "session": 1}
+    {"id": 5, "cmd": "stats"}
+
+Every session is a GameState held in memory. When it is the AI's turn the
+move request joins its session's queue, as does the playout scoring of a
+finished game. One fixed-size process pool (the
+AnalysisService workers) serves all sessions. The scheduler takes requests
+round-robin across sessions with work queued, so one busy session cannot
+starve the others. Each session has its own thinking-time budget, charged
+with the search time of its moves. A pool whose worker died is replaced.
+Sessions end with the connection that created them.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ..game.board import GoBoard
+from ..game.game_state import GameState
+from .analysis import _analyzePosition, _initWorker
+
+class GameSession:
+
+    def __init__(self, session_id, ai_color, komi=GameState.KOMI, time_budget=None):
+        self.id = session_id
+        self.ai_color = ai_color
+        # Playouts that score the finished game run in the worker pool
+        self.game_state = GameState(GameState.MODE_PVAI, komi, playouts=0)
+        # Seconds of AI thinking time left for the whole game (None: unlimited)
+        self.time_left = time_budget
+        self.ai_moves = 0
+        self.ai_time = 0.0
+        # Serialises commands of clients sharing a session
+        self.lock = asyncio.Lock()
+
+    def isAiTurn(self):
+        return not self.game_state.game_over and self.game_state.current_player == self.ai_color
+
+    def applyMove(self, move):
+        """Play move (None = pass) for the side to move; False if illegal"""
+        if move is None:
+            self.game_state.passTurn()
+            return True
+        return self.game_state.makeMove(move[0], move[1])
+
+    def getState(self):
+        black_score, white_score = self.game_state.getScore()
+        return {
+            'session': self.id,
+            'board': self.game_state.board.toRows(),
+            'to_move': 'B' if self.game_state.current_player == GoBoard.BLACK else 'W',
+            'ai_color': 'B' if self.ai_color == GoBoard.BLACK else 'W',
+            'pass_count': self.game_state.pass_count,
+            'score': [black_score, white_score],
+            'game_over': self.game_state.game_over,
+            'winner': self.game_state.winner,
+            'time_left': self.time_left,
+            'ai_moves': self.ai_moves,
+        }
+
+class GameServer:
+
+    COLORS = {'b': GoBoard.BLACK, 'black': GoBoard.BLACK,
+              'w': GoBoard.WHITE, 'white': GoBoard.WHITE}
+
+    # Per-move time from a session budget, as GtpEngine.timeForMove
+    DEFAULT_MOVES_LEFT = 30
+    TIME_SAFETY = 0.8
+    MIN_TIME = 0.1
+
+    def __init__(self, workers=None, depth=3, time_limit=5.0, max_sessions=1000, cache_path=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.depth = depth
+        self.time_limit = time_limit  # Cap on any single move
+        self.max_sessions = max_sessions
+        self.cache_path = cache_path
+        self.executor = None
+        self.server = None
+        self.connections = {}  # Client handler task -> its writer
+
+        self.sessions = {}
+        self.next_session_id = 1
+        # Fair scheduling: per-session FIFO queues of (function, request,
+        # future, queued_at) and the round-robin order of sessions with work queued
+        self.queues = {}
+        self.ready = deque()
+        self.in_flight = 0
+
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.total_wait = 0.0
+
+    def start(self):
+        if self.executor is None:
+            # spawn: forked workers would inherit client sockets and keep
+            # closed connections open
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initWorker,
+                initargs=(self.depth, self.time_limit, self.cache_path),
+            )
+        return self
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def _restartExecutor(self):
+        # A broken pool fails every later submit; start a fresh one
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.restarts += 1
+        self.start()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """Listen for clients; returns the asyncio server (port 0 picks a free one)"""
+        self.start()
+        self.server = await asyncio.start_server(self._handleClient, host, port)
+        return self.server
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            # Cancelled, not just closed: a handler may be waiting on a search
+            for task in self.connections:
+                task.cancel()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+        # Waits for running searches, so off the event loop
+        await asyncio.to_thread(self.close)
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    async def newSession(self, ai_color=GoBoard.WHITE, komi=GameState.KOMI, time_budget=None):
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("too many sessions")
+        session = GameSession(self.next_session_id, ai_color, komi, time_budget)
+        self.sessions[session.id] = session
+        self.next_session_id += 1
+
+        # The AI may have the first move; a session it fails to make is
+        # not kept
+        async with session.lock:
+            try:
+                ai_move = await self._aiTurn(session)
+            except BaseException:
+                del self.sessions[session.id]
+                raise
+        return session, ai_move
+
+    async def play(self, session_id, move):
+        """Play the human move, then the AI's reply; returns the AI move"""
+        session = self._getSession(session_id)
+        async with session.lock:
+            if session.game_state.game_over:
+                raise ValueError("game over")
+            if session.isAiTurn():
+                raise ValueError("not your turn (AI move pending, request the state to retry it)")
+            if not session.applyMove(move):
+                raise ValueError("illegal move")
+            ai_move = await self._aiTurn(session)
+            await self._scoreGame(session)
+            return ai_move
+
+    async def resume(self, session_id):
+        """Make the AI move or final scoring a failed request left pending;
+        returns the AI move (None when the human is to move)"""
+        session = self._getSession(session_id)
+        async with session.lock:
+            ai_move = await self._aiTurn(session)
+            await self._scoreGame(session)
+            return ai_move
+
+    def closeSession(self, session_id):
+        session = self._getSession(session_id)
+        del self.sessions[session.id]
+        return session
+
+    def _getSession(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"unknown session {session_id!r}")
+        return session
+
+    async def _aiTurn(self, session):
+        if not session.isAiTurn():
+            return None
+
+        game_state = session.game_state
+        request = {
+            'id': session.id,
+            'board': game_state.board.toRows(),
+            'ko': game_state.board.ko_point,
+            'color': session.ai_color,
+            'pass_count': game_state.pass_count,
+            'time_limit': self.timeForMove(session),
+        }
+        result = await self._submit(session.id, request)
+
+        stats = result['stats']
+        session.ai_moves += 1
+        session.ai_time += stats['elapsed']
+        if session.time_left is not None:
+            session.time_left = max(0.0, session.time_left - stats['elapsed'])
+
+        move = tuple(result['move']) if result['move'] else None
+        if move is None or not session.applyMove(move):
+            move = None
+            session.applyMove(None)
+        return move
+
+    async def _scoreGame(self, session):
+        # Dead stones of a finished game, from playouts run in the pool
+        game_state = session.game_state
+        if game_state.game_over and not game_state.hasOwnershipEstimate():
+            estimate = await self._submit(session.id, game_state.board, GameState.estimateOwnership)
+            game_state.setOwnershipEstimate(estimate)
+
+    def timeForMove(self, session):
+        if session.time_left is None:
+            return self.time_limit
+        budget = session.time_left / self.DEFAULT_MOVES_LEFT * self.TIME_SAFETY
+        return max(self.MIN_TIME, min(self.time_limit, budget))
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _submit(self, session_id, request, function=_analyzePosition):
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.get(session_id)
+        if queue is None:
+            queue = self.queues[session_id] = deque()
+        if not queue:
+            self.ready.append(session_id)
+        queue.append((function, request, future, time.time()))
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        # Hand queued requests to free workers, one session at a time
+        loop = asyncio.get_running_loop()
+        while self.in_flight < self.workers and self.ready:
+            session_id = self.ready.popleft()
+            queue = self.queues[session_id]
+            function, request, future, queued_at = queue.popleft()
+            if queue:
+                self.ready.append(session_id)
+            else:
+                del self.queues[session_id]
+
+            self.queued -= 1
+            self.in_flight += 1
+            self.total_wait += time.time() - queued_at
+            try:
+                work = loop.run_in_executor(self.executor, function, request)
+            except BrokenProcessPool:
+                # A worker died while the pool was idle
+                self._restartExecutor()
+                work = loop.run_in_executor(self.executor, function, request)
+            work.add_done_callback(lambda work, future=future, executor=self.executor:
+                                   self._finished(work, future, executor))
+
+    def _finished(self, work, future, executor):
+        self.in_flight -= 1
+        if work.exception() is not None:
+            self.failed += 1
+            # Only the first failure of a broken pool replaces it
+            if isinstance(work.exception(), BrokenProcessPool) and executor is self.executor:
+                self._restartExecutor()
+            if not future.done():
+                future.set_exception(work.exception())
+        else:
+            self.completed += 1
+            if not future.done():
+                future.set_result(work.result())
+        self._dispatch()
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+
+    async def _handleClient(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections[task] = writer
+        owned = set()  # Sessions this client created and has not closed
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle(line.decode(), owned)
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # stop(); ends the handler without an error report from asyncio
+        finally:
+            del self.connections[task]
+            writer.close()
+            # A client that disconnects without closing its games leaks none
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+
+    async def handle(self, line, owned=None):
+        """Answer one JSON request line with a response dict; owned collects
+        the ids of the sessions it creates and drops those it closes"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            request_id = request.get('id')
+            response = await self._command(request, owned if owned is not None else set())
+        except (ValueError, KeyError, TypeError) as e:
+            return {'id': request_id, 'error': str(e)}
+        except Exception as e:
+            # A failed search must not take the connection down
+            return {'id': request_id, 'error': f"{type(e).__name__}: {e}"}
+        response['id'] = request_id
+        return response
+
+    async def _command(self, request, owned):
+        cmd = request.get('cmd')
+        if cmd == 'new':
+            ai_color = self.COLORS.get(str(request.get('ai_color', 'w')).lower())
+            if ai_color is None:
+                raise ValueError(f"invalid ai_color {request.get('ai_color')!r}")
+            time_budget = request.get('time_budget')
+            session, ai_move = await self.newSession(
+                ai_color, float(request.get('komi', GameState.KOMI)),
+                None if time_budget is None else float(time_budget))
+            owned.add(session.id)
+            return dict(await self._getState(session), ai_move=ai_move)
+        if cmd == 'play':
+            move = request['move']
+            if move is not None:
+                move = (int(move[0]), int(move[1]))
+            ai_move = await self.play(request['session'], move)
+            return dict(await self._getState(self._getSession(request['session'])), ai_move=ai_move)
+        if cmd == 'state':
+            ai_move = await self.resume(request['session'])
+            return dict(await self._getState(self._getSession(request['session'])), ai_move=ai_move)
+        if cmd == 'close':
+            session = self.closeSession(request['session'])
+            owned.discard(session.id)
+            return {'session': session.id, 'closed': True}
+        if cmd == 'stats':
+            return self.getStats()
+        raise ValueError(f"unknown command {cmd!r}")
+
+    async def _getState(self, session):
+        async with session.lock:
+            return session.getState()
+
+    def getStats(self):
+        # Every dispatched request waited, failed ones included
+        finished = self.completed + self.failed
+        return {
+            'workers': self.workers,
+            'sessions': len(self.sessions),
+            'queue_depth': self.queued,
+            'max_queue_depth': self.max_queued,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'failed': self.failed,
+            'restarts': self.restarts,
+            'avg_wait': self.total_wait / finished if finished else 0.0,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PvAI Go games over JSON lines")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--time-limit', type=float, default=5.0)
+    parser.add_argument('--max-sessions', type=int, default=1000)
+    parser.add_argument('--cache', help="persistent position cache (SQLite file)")
+    args = parser.parse_args(argv)
+
+    game_server = GameServer(args.workers, args.depth, args.time_limit, args.max_sessions, args.cache)
+
+    async def run():
+        server = await game_server.serve(args.host, args.port)
+        address = server.sockets[0].getsockname()
+        print(f"Serving on {address[0]}:{address[1]}", file=sys.stderr)
+        try:
+            await server.serve_forever()
+        finally:
+            await game_server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(game_server.getStats()), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,7 @@
 
 from .board import GoBoard
 from .game_state import GameState
+from .benson import BensonLife
+from .symmetry import BoardSymmetry
 
-__all__ = ['GoBoard', 'GameState']
+__all__ = ['GoBoard', 'GameState', 'BensonLife', 'BoardSymmetry']
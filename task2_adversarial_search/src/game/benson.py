@@ -0,0 +1,146 @@
+from collections import deque
+
+class BensonLife:
+    """Benson's algorithm for unconditionally alive strings.
+
+    A string is unconditionally alive when it cannot be captured even if the
+    opponent gets to play every move. The regions those strings enclose
+    (every empty point being a liberty of an alive string) are settled
+    territory: nothing the opponent plays there can live, and filling them is
+    pointless for the owner.
+    """
+
+    NEIGHBORS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    @staticmethod
+    def findAlive(board, color):
+        """Return (alive_points, territory_points) for color"""
+        chains, chain_of = BensonLife._findChains(board, color)
+        regions = BensonLife._findRegions(board, color, chain_of)
+
+        # Region i is vital to chain c when all its empty points are liberties of c
+        vital = [set() for _ in chains]
+        for index, (points, empties, neighbors) in enumerate(regions):
+            for chain_id in neighbors:
+                liberties = chains[chain_id][1]
+                if empties and empties <= liberties:
+                    vital[chain_id].add(index)
+
+        alive_chains = set(range(len(chains)))
+        live_regions = set(range(len(regions)))
+
+        while True:
+            # Drop chains with fewer than two vital regions
+            dead = {c for c in alive_chains if len(vital[c] & live_regions) < 2}
+            if not dead:
+                break
+            alive_chains -= dead
+
+            # Drop regions that touch a chain which is no longer alive
+            live_regions = {r for r in live_regions if regions[r][2] <= alive_chains}
+
+        alive_points = set()
+        for chain_id in alive_chains:
+            alive_points |= chains[chain_id][0]
+
+        territory_points = set()
+        for index in live_regions:
+            if any(index in vital[c] for c in alive_chains):
+                territory_points |= regions[index][0]
+
+        return alive_points, territory_points
+
+    @staticmethod
+    def getSettledOwnership(board):
+        """Map every unconditionally settled point to the colour that owns it"""
+        settled = {}
+        for color in (board.BLACK, board.WHITE):
+            alive_points, territory_points = BensonLife.findAlive(board, color)
+            for point in alive_points | territory_points:
+                settled[point] = color
+        return settled
+
+    @staticmethod
+    def getOwnership(board):
+        """Per-point owner grid: area ownership overridden by settled points"""
+        ownership = board.getOwnership()
+        for (row, col), color in BensonLife.getSettledOwnership(board).items():
+            ownership[row][col] = color
+        return ownership
+
+    @staticmethod
+    def getScore(board, color):
+        """Area score for color, counting dead stones in settled regions"""
+        return sum(row.count(color) for row in BensonLife.getOwnership(board))
+
+    @staticmethod
+    def _findChains(board, color):
+        # chains[i] = (stones, liberties); chain_of maps a stone to its chain index
+        chains = []
+        chain_of = {}
+
+        for row in range(board.size):
+            for col in range(board.size):
+                if board.board[row][col] != color or (row, col) in chain_of:
+                    continue
+
+                stones = set()
+                liberties = set()
+                queue = deque([(row, col)])
+                chain_of[(row, col)] = len(chains)
+
+                while queue:
+                    r, c = queue.popleft()
+                    stones.add((r, c))
+                    for dr, dc in BensonLife.NEIGHBORS:
+                        nr, nc = r + dr, c + dc
+                        if not board.isValidPosition(nr, nc):
+                            continue
+                        stone = board.board[nr][nc]
+                        if stone == board.EMPTY:
+                            liberties.add((nr, nc))
+                        elif stone == color and (nr, nc) not in chain_of:
+                            chain_of[(nr, nc)] = len(chains)
+                            queue.append((nr, nc))
+
+                chains.append((stones, liberties))
+
+        return chains, chain_of
+
+    @staticmethod
+    def _findRegions(board, color, chain_of):
+        # Maximal connected areas of points not occupied by color:
+        # regions[i] = (points, empty_points, bordering_chain_ids)
+        regions = []
+        seen = set()
+
+        for row in range(board.size):
+            for col in range(board.size):
+                if board.board[row][col] == color or (row, col) in seen:
+                    continue
+
+                points = set()
+                empties = set()
+                neighbors = set()
+                queue = deque([(row, col)])
+                seen.add((row, col))
+
+                while queue:
+                    r, c = queue.popleft()
+                    points.add((r, c))
+                    if board.board[r][c] == board.EMPTY:
+                        empties.add((r, c))
+
+                    for dr, dc in BensonLife.NEIGHBORS:
+                        nr, nc = r + dr, c + dc
+                        if not board.isValidPosition(nr, nc):
+                            continue
+                        if board.board[nr][nc] == color:
+                            neighbors.add(chain_of[(nr, nc)])
+                        elif (nr, nc) not in seen:
+                            seen.add((nr, nc))
+                            queue.append((nr, nc))
+
+                regions.append((points, empties, neighbors))
+
+        return regions
@@ -1,3 +1,34 @@
+from collections import deque
+from .symmetry import SYMMETRY_COUNT, buildZobristTables
+
+# 3x3 pattern neighbourhood, in key order (2 bits per neighbour, NW first)
+PATTERN_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+PATTERN_OFF_BOARD = 3
+
+def _buildPatternTables(size):
+    # neighbors[r][c]: (nr, nc, shift) for every point whose key contains (r, c)
+    neighbors = [[[] for _ in range(size)] for _ in range(size)]
+    empty_keys = [[0] * size for _ in range(size)]
+    
+    for row in range(size):
+        for col in range(size):
+            for slot, (dr, dc) in enumerate(PATTERN_OFFSETS):
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    # (row, col) is at the opposite offset (slot 7 - slot)
+                    # in the key of (nr, nc)
+                    neighbors[row][col].append((nr, nc, 2 * (7 - slot)))
+                else:
+                    empty_keys[row][col] |= PATTERN_OFF_BOARD << (2 * slot)
+    
+    return neighbors, empty_keys
+
+def _buildNeighborTable(size):
+    # neighbors[r][c]: on-board orthogonal neighbours of (r, c)
+    return [[[(r + dr, c + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+              if 0 <= r + dr < size and 0 <= c + dc < size]
+             for c in range(size)] for r in range(size)]
+
 class GoBoard:
     
     EMPTY = 0
@@ -5,17 +36,76 @@ class GoBoard:
     WHITE = 2
     BOARD_SIZE = 9
     
+    # ASCII encoding used to exchange positions with other processes/tools
+    ROW_SYMBOLS = {EMPTY: '.', BLACK: 'X', WHITE: 'O'}
+    
+    PATTERN_NEIGHBORS, EMPTY_PATTERN_KEYS = _buildPatternTables(BOARD_SIZE)
+    
+    # Zobrist keys per colour/point, and per colour/point/symmetry
+    ZOBRIST, SYMMETRIC_ZOBRIST, KO_ZOBRIST = buildZobristTables(BOARD_SIZE)
+    
+    NEIGHBORS = _buildNeighborTable(BOARD_SIZE)
+    
+    # Every region holds at least one point; +1 for the region being split
+    MAX_REGIONS = BOARD_SIZE * BOARD_SIZE + 1
+    
     def __init__(self):
         self.size = self.BOARD_SIZE
         self.board = [[self.EMPTY for _ in range(self.size)] for _ in range(self.size)]
         self.last_move = None
         self.ko_point = None  # For Ko rule
         
+        # 3x3 neighbourhood key of every point, kept up to date by _setStone
+        self.pattern_keys = [row[:] for row in self.EMPTY_PATTERN_KEYS]
+        
+        # Zobrist hash of the stones as seen through each of the 8 symmetries;
+        # symmetry_hashes[0] is the plain position hash
+        self.symmetry_hashes = [0] * SYMMETRY_COUNT
+        
+        # Empty regions, kept up to date by _setStone: region id of every
+        # empty point (-1 on stones), size and number of (point, stone)
+        # contacts per bordering colour of every region, and the area
+        # (stones + regions bordered by that colour alone) of each colour
+        self.region_of = [[0] * self.size for _ in range(self.size)]
+        self.region_size = [0] * self.MAX_REGIONS
+        self.region_size[0] = self.size * self.size
+        self.region_borders = [None, [0] * self.MAX_REGIONS, [0] * self.MAX_REGIONS]
+        self.free_regions = list(range(self.MAX_REGIONS - 1, 0, -1))
+        self.area = [0, 0, 0]
+    
+    @classmethod
+    def fromRows(cls, rows, ko_point=None):
+        symbol_colors = {symbol: color for color, symbol in cls.ROW_SYMBOLS.items()}
+        board = cls()
+        if len(rows) != board.size or any(len(row) != board.size for row in rows):
+            raise ValueError(f"expected {board.size} rows of {board.size} points")
+        
+        for row, line in enumerate(rows):
+            for col, symbol in enumerate(line):
+                if symbol not in symbol_colors:
+                    raise ValueError(f"invalid point {symbol!r} at ({row}, {col})")
+                board._setStone(row, col, symbol_colors[symbol])
+        
+        board.ko_point = tuple(ko_point) if ko_point else None
+        return board
+    
+    def toRows(self):
+        return [''.join(self.ROW_SYMBOLS[cell] for cell in row) for row in self.board]
+    
     def copy(self):
-        new_board = GoBoard()
+        # Skip __init__: every attribute is overwritten below
+        new_board = GoBoard.__new__(GoBoard)
+        new_board.size = self.size
         new_board.board = [row[:] for row in self.board]
         new_board.last_move = self.last_move
         new_board.ko_point = self.ko_point
+        new_board.pattern_keys = [row[:] for row in self.pattern_keys]
+        new_board.symmetry_hashes = self.symmetry_hashes[:]
+        new_board.region_of = [row[:] for row in self.region_of]
+        new_board.region_size = self.region_size[:]
+        new_board.region_borders = [None, self.region_borders[1][:], self.region_borders[2][:]]
+        new_board.free_regions = self.free_regions[:]
+        new_board.area = self.area[:]
         return new_board
     
     def isValidPosition(self, row, col):
@@ -26,6 +116,167 @@ class GoBoard:
             return None
         return self.board[row][col]
     
+    def getPatternKey(self, row, col):
+        return self.pattern_keys[row][col]
+    
+    def getHash(self):
+        # Stones plus ko point; side to move is up to the caller
+        if self.ko_point is None:
+            return self.symmetry_hashes[0]
+        return self.symmetry_hashes[0] ^ self.KO_ZOBRIST[self.ko_point[0]][self.ko_point[1]][0]
+    
+    def _setStone(self, row, col, color):
+        # Single mutation point for board contents: keeps derived state in sync
+        old = self.board[row][col]
+        if old == color:
+            return
+        self.board[row][col] = color
+        
+        delta = old ^ color
+        pattern_keys = self.pattern_keys
+        for nr, nc, shift in self.PATTERN_NEIGHBORS[row][col]:
+            pattern_keys[nr][nc] ^= delta << shift
+        
+        hashes = self.symmetry_hashes
+        old_keys = self.SYMMETRIC_ZOBRIST[old][row][col]
+        new_keys = self.SYMMETRIC_ZOBRIST[color][row][col]
+        for s in range(SYMMETRY_COUNT):
+            hashes[s] ^= old_keys[s] ^ new_keys[s]
+        
+        if old != self.EMPTY:
+            self.board[row][col] = self.EMPTY
+            self._stoneRemoved(row, col, old)
+            self.board[row][col] = color
+        if color != self.EMPTY:
+            self._stoneAdded(row, col, color)
+    
+    def _regionOwner(self, region):
+        black = self.region_borders[self.BLACK][region]
+        white = self.region_borders[self.WHITE][region]
+        if black and not white:
+            return self.BLACK
+        if white and not black:
+            return self.WHITE
+        return self.EMPTY
+    
+    def _scoreRegion(self, region, sign):
+        # Add (sign=1) or remove (sign=-1) the region's territory from area
+        owner = self._regionOwner(region)
+        if owner != self.EMPTY:
+            self.area[owner] += sign * self.region_size[region]
+    
+    def _stoneAdded(self, row, col, color):
+        # The point leaves its empty region, which may split in up to four
+        region = self.region_of[row][col]
+        self._scoreRegion(region, -1)
+        self.area[color] += 1
+        self.region_of[row][col] = -1
+        self.region_size[region] -= 1
+        
+        empties = []
+        for nr, nc in self.NEIGHBORS[row][col]:
+            neighbor = self.board[nr][nc]
+            if neighbor == self.EMPTY:
+                empties.append((nr, nc))
+                self.region_borders[color][region] += 1
+            else:
+                self.region_borders[neighbor][region] -= 1
+        
+        if not empties:
+            self.region_borders[self.BLACK][region] = 0
+            self.region_borders[self.WHITE][region] = 0
+            self.free_regions.append(region)
+        elif len(empties) == 1 or self._regionConnected(region, empties):
+            self._scoreRegion(region, 1)
+        else:
+            for nr, nc in empties:
+                if self.region_of[nr][nc] == region:
+                    self._splitRegion(region, nr, nc)
+            self.region_size[region] = 0
+            self.region_borders[self.BLACK][region] = 0
+            self.region_borders[self.WHITE][region] = 0
+            self.free_regions.append(region)
+    
+    def _regionConnected(self, region, points):
+        # Flood from the first point until every other one is reached
+        targets = set(points[1:])
+        seen = {points[0]}
+        queue = deque([points[0]])
+        while queue:
+            point = queue.popleft()
+            targets.discard(point)
+            if not targets:
+                return True
+            for neighbor in self.NEIGHBORS[point[0]][point[1]]:
+                if neighbor not in seen and self.region_of[neighbor[0]][neighbor[1]] == region:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return False
+    
+    def _splitRegion(self, region, row, col):
+        # Move the part of region reachable from (row, col) to a new region
+        new_region = self.free_regions.pop()
+        borders = self.region_borders
+        self.region_of[row][col] = new_region
+        queue = deque([(row, col)])
+        size = 0
+        while queue:
+            r, c = queue.popleft()
+            size += 1
+            for nr, nc in self.NEIGHBORS[r][c]:
+                neighbor = self.board[nr][nc]
+                if neighbor != self.EMPTY:
+                    borders[neighbor][new_region] += 1
+                elif self.region_of[nr][nc] == region:
+                    self.region_of[nr][nc] = new_region
+                    queue.append((nr, nc))
+        self.region_size[new_region] = size
+        self._scoreRegion(new_region, 1)
+    
+    def _stoneRemoved(self, row, col, color):
+        # The point becomes empty, merging the regions around it
+        self.area[color] -= 1
+        borders = self.region_borders
+        regions = []
+        stones = []
+        for nr, nc in self.NEIGHBORS[row][col]:
+            neighbor = self.board[nr][nc]
+            if neighbor == self.EMPTY:
+                region = self.region_of[nr][nc]
+                if region not in regions:
+                    self._scoreRegion(region, -1)
+                    regions.append(region)
+                borders[color][region] -= 1
+            else:
+                stones.append(neighbor)
+        
+        if regions:
+            target = max(regions, key=self.region_size.__getitem__)
+            for region in regions:
+                if region != target:
+                    self._mergeRegion(region, target)
+        else:
+            target = self.free_regions.pop()
+        
+        self.region_of[row][col] = target
+        self.region_size[target] += 1
+        for neighbor in stones:
+            borders[neighbor][target] += 1
+        self._scoreRegion(target, 1)
+    
+    def _mergeRegion(self, region, target):
+        for r in range(self.size):
+            row = self.region_of[r]
+            for c in range(self.size):
+                if row[c] == region:
+                    row[c] = target
+        self.region_size[target] += self.region_size[region]
+        for color in (self.BLACK, self.WHITE):
+            self.region_borders[color][target] += self.region_borders[color][region]
+            self.region_borders[color][region] = 0
+        self.region_size[region] = 0
+        self.free_regions.append(region)
+    
     def placeStone(self, row, col, color):
         if not self.isValidPosition(row, col):
             return False
@@ -38,7 +289,7 @@ class GoBoard:
             return False
         
         # Place stone
-        self.board[row][col] = color
+        self._setStone(row, col, color)
         self.last_move = (row, col)
         
         # Capture opponent stones
@@ -55,12 +306,12 @@ class GoBoard:
         # Remove captured stones
         for group in captured_groups:
             for r, c in group:
-                self.board[r][c] = self.EMPTY
+                self._setStone(r, c, self.EMPTY)
         
         # Check if placed stone has liberties (suicide rule)
         own_group = self._getGroup(row, col)
         if self._countLiberties(own_group) == 0 and len(captured_groups) == 0:
-            self.board[row][col] = self.EMPTY  # Revert move
+            self._setStone(row, col, self.EMPTY)  # Revert move
             self.last_move = None
             return False
         
@@ -80,79 +331,99 @@ class GoBoard:
         if color == self.EMPTY:
             return []
         
-        visited = set()
+        board = self.board
+        neighbors = self.NEIGHBORS
+        visited = {(row, col)}
         group = []
-        queue = [(row, col)]
+        queue = deque([(row, col)])
         
         while queue:
-            r, c = queue.pop(0)
-            if (r, c) in visited:
-                continue
-            
-            visited.add((r, c))
-            group.append((r, c))
+            point = queue.popleft()
+            group.append(point)
             
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                if (self.isValidPosition(nr, nc) and 
-                    (nr, nc) not in visited and 
-                    self.board[nr][nc] == color):
+            for nr, nc in neighbors[point[0]][point[1]]:
+                if board[nr][nc] == color and (nr, nc) not in visited:
+                    visited.add((nr, nc))
                     queue.append((nr, nc))
         
         return group
     
     def _countLiberties(self, group):
+        board = self.board
+        neighbors = self.NEIGHBORS
         liberties = set()
         
         for row, col in group:
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = row + dr, col + dc
-                if (self.isValidPosition(nr, nc) and 
-                    self.board[nr][nc] == self.EMPTY):
+            for nr, nc in neighbors[row][col]:
+                if board[nr][nc] == self.EMPTY:
                     liberties.add((nr, nc))
         
         return len(liberties)
     
-    def getLegalMoves(self, color):
+    def getLegalMoves(self, color, skip=None):
         legal_moves = []
         
         for row in range(self.size):
             for col in range(self.size):
                 if self.board[row][col] == self.EMPTY:
+                    if skip and (row, col) in skip:
+                        continue
                     # Try placing stone
                     temp_board = self.copy()
                     if temp_board.placeStone(row, col, color):
                         legal_moves.append((row, col))
         
         return legal_moves
-    
+
+    def isEye(self, row, col, color):
+        # True single-point eye of color: every neighbour is color and too
+        # few enemy diagonals to make it false (none allowed on the edge)
+        if self.board[row][col] != self.EMPTY:
+            return False
+        for nr, nc in self.NEIGHBORS[row][col]:
+            if self.board[nr][nc] != color:
+                return False
+
+        opponent = self.WHITE if color == self.BLACK else self.BLACK
+        enemy_diagonals = 0
+        on_edge = False
+        for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+            nr, nc = row + dr, col + dc
+            if not self.isValidPosition(nr, nc):
+                on_edge = True
+            elif self.board[nr][nc] == opponent:
+                enemy_diagonals += 1
+        return enemy_diagonals < (1 if on_edge else 2)
+
     def getTerritoryScore(self, color):
-        visited = [[False] * self.size for _ in range(self.size)]
-        territory = 0
-        
-        # Count stones
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.board[row][col] == color:
-                    territory += 1
+        # Stones plus empty regions bordered only by color, kept incrementally
+        return self.area[color]
+    
+    def getOwnership(self):
+        # Owner of every point: stones belong to their colour, empty regions
+        # to the single colour bordering them (EMPTY when neutral)
+        ownership = [row[:] for row in self.board]
+        owners = {}
         
-        # Count controlled empty territory
         for row in range(self.size):
+            regions = self.region_of[row]
             for col in range(self.size):
-                if self.board[row][col] == self.EMPTY and not visited[row][col]:
-                    empty_region, owner = self._analyzeEmptyRegion(row, col, visited)
-                    if owner == color:
-                        territory += len(empty_region)
+                region = regions[col]
+                if region >= 0:
+                    owner = owners.get(region)
+                    if owner is None:
+                        owner = owners[region] = self._regionOwner(region)
+                    ownership[row][col] = owner
         
-        return territory
+        return ownership
     
     def _analyzeEmptyRegion(self, start_row, start_col, visited):
         region = []
-        queue = [(start_row, start_col)]
+        queue = deque([(start_row, start_col)])
         adjacent_colors = set()
         
         while queue:
-            row, col = queue.pop(0)
+            row, col = queue.popleft()
             
             if not self.isValidPosition(row, col) or visited[row][col]:
                 continue
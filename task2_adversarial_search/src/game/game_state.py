@@ -1,18 +1,39 @@
 from .board import GoBoard
+from .benson import BensonLife
 
 class GameState:
     
     MODE_PVP = "pvp"  # Player vs Player
     MODE_PVAI = "pvai"  # Player vs AI
     
-    def __init__(self, mode=MODE_PVAI):
+    KOMI = 6.5  # Compensation for White playing second
+    
+    # Monte Carlo scoring: random playouts from the position estimate who
+    # ends up owning each point (0 disables it, as does a missing numpy).
+    # They run when a score is first asked for, not when the game ends;
+    # callers that cannot block run them elsewhere and hand the result to
+    # setOwnershipEstimate().
+    # A point goes to a colour when its mean ownership is at least
+    # OWNERSHIP_THRESHOLD (+1 = Black in every playout, -1 = White); random
+    # playouts are noisy, so a clear majority is enough
+    PLAYOUTS = 256
+    OWNERSHIP_THRESHOLD = 0.15
+    
+    def __init__(self, mode=MODE_PVAI, komi=KOMI, playouts=PLAYOUTS):
         self.board = GoBoard()
+        self.komi = komi
+        self.playouts = playouts
         self.current_player = GoBoard.BLACK  # Black plays first
         self.mode = mode
         self.move_history = []
         self.pass_count = 0
         self.game_over = False
-        self.winner = None
+        
+        # Bumped whenever makeMove/passTurn changes the position; keys the
+        # score/ownership cache so repeated getScore() calls are free
+        self.version = 0
+        self._score_cache = None
+        self._estimate = None  # (version, ownership estimate) set by a caller
         
     def switchPlayer(self):
         self.current_player = (GoBoard.WHITE if self.current_player == GoBoard.BLACK 
@@ -25,6 +46,7 @@ class GameState:
         success = self.board.placeStone(row, col, self.current_player)
         
         if success:
+            self.version += 1
             self.move_history.append((row, col, self.current_player))
             self.pass_count = 0
             self.switchPlayer()
@@ -34,6 +56,7 @@ class GameState:
         return False
     
     def passTurn(self):
+        self.version += 1
         self.pass_count += 1
         self.switchPlayer()
         
@@ -42,36 +65,102 @@ class GameState:
             self._checkGameOver()
     
     def _checkGameOver(self):
+        # Scoring is left to the first getScore()/winner
         if self.pass_count >= 2 or self.board.isGameOver():
             self.game_over = True
-            
-            # Calculate scores
-            black_score = self.board.getTerritoryScore(GoBoard.BLACK)
-            white_score = self.board.getTerritoryScore(GoBoard.WHITE)
-            
-            # Add komi for white (compensation for playing second)
-            komi = 6.5
-            white_score += komi
-            
-            if black_score > white_score:
-                self.winner = GoBoard.BLACK
-            else:
-                self.winner = GoBoard.WHITE
+    
+    @property
+    def winner(self):
+        if not self.game_over:
+            return None
+        # Scores include komi for white
+        black_score, white_score = self.getScore()
+        return GoBoard.BLACK if black_score > white_score else GoBoard.WHITE
     
     def getLegalMoves(self):
         return self.board.getLegalMoves(self.current_player)
     
     def getScore(self):
-        black_score = self.board.getTerritoryScore(GoBoard.BLACK)
-        white_score = self.board.getTerritoryScore(GoBoard.WHITE) + 6.5
+        black_score, white_score = self._getScoreCache()[:2]
         return black_score, white_score
     
+    def getOwnership(self):
+        # Per-point owner grid (EMPTY = neutral); shared, do not modify
+        return self._getScoreCache()[2]
+    
+    def getDeadStones(self):
+        """Stones that count for the opponent, as (row, col) points"""
+        return self._getScoreCache()[3]
+    
+    def setOwnershipEstimate(self, estimate):
+        """Score the current position with an estimateOwnership() grid made
+        elsewhere (None: no dead stones) instead of running playouts here"""
+        self._estimate = (self.version, estimate)
+    
+    def hasOwnershipEstimate(self):
+        return self._estimate is not None and self._estimate[0] == self.version
+    
+    def _getScoreCache(self):
+        key = (self.version, self.komi, self.playouts, self.hasOwnershipEstimate())
+        if self._score_cache is None or self._score_cache[0] != key:
+            if self.hasOwnershipEstimate():
+                estimate = self._estimate[1]
+            else:
+                estimate = GameState.estimateOwnership(self.board, self.playouts)
+            black_score, white_score, ownership = GameState.scoreBoard(self.board, self.komi, estimate)
+            dead = [(row, col) for row in range(self.board.size) for col in range(self.board.size)
+                    if self.board.board[row][col] not in (GoBoard.EMPTY, ownership[row][col])]
+            self._score_cache = (key, (black_score, white_score, ownership, dead))
+        return self._score_cache[1]
+    
+    @staticmethod
+    def estimateOwnership(board, playouts=PLAYOUTS):
+        """Mean playout owner of every point (+1 Black .. -1 White), or None
+        when disabled or numpy is missing"""
+        if playouts <= 0:
+            return None
+        try:
+            # Imported here: numpy is optional and slow to load
+            from .playout import BatchPlayout
+        except ImportError:
+            return None
+        # Half the playouts with each side to move, so that the score does
+        # not depend on who passed last
+        black_first = BatchPlayout.estimateOwnership(board, GoBoard.BLACK, (playouts + 1) // 2, seed=0)
+        white_first = BatchPlayout.estimateOwnership(board, GoBoard.WHITE, playouts // 2 or 1, seed=1)
+        return (black_first + white_first) / 2
+    
+    @staticmethod
+    def scoreBoard(board, komi=KOMI, estimate=None):
+        """Return (black_score, white_score, ownership) of board, with dead
+        stones taken from an estimateOwnership() grid when one is given"""
+        # Area scoring; unconditionally settled regions count in full for
+        # their owner, including any dead stones inside them
+        ownership = BensonLife.getOwnership(board)
+        if estimate is not None:
+            # Playouts decide where they agree; settled points and the rest
+            # of the board keep their area/Benson owner
+            settled = BensonLife.getSettledOwnership(board)
+            for row in range(board.size):
+                for col in range(board.size):
+                    if (row, col) in settled:
+                        continue
+                    if estimate[row][col] >= GameState.OWNERSHIP_THRESHOLD:
+                        ownership[row][col] = GoBoard.BLACK
+                    elif estimate[row][col] <= -GameState.OWNERSHIP_THRESHOLD:
+                        ownership[row][col] = GoBoard.WHITE
+        black_score = sum(row.count(GoBoard.BLACK) for row in ownership)
+        white_score = sum(row.count(GoBoard.WHITE) for row in ownership) + komi
+        return black_score, white_score, ownership
+    
     def copy(self):
-        new_state = GameState(self.mode)
+        new_state = GameState(self.mode, self.komi, self.playouts)
         new_state.board = self.board.copy()
         new_state.current_player = self.current_player
         new_state.move_history = self.move_history[:]
         new_state.pass_count = self.pass_count
         new_state.game_over = self.game_over
         new_state.winner = self.winner
+        new_state.version = self.version
+        new_state._score_cache = self._score_cache
         return new_state
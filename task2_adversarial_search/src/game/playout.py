@@ -0,0 +1,259 @@
+"""Vectorised random playouts.
+
+BatchPlayout advances many independent games in lockstep as NumPy arrays:
+every step labels all strings, counts their liberties, builds the legality
+mask of the side to move in every game, picks one random legal move per
+game and resolves captures, all without a Python loop over games. Rules
+match GoBoard (no suicide, single-stone captures set the ko point), and
+like most playout policies it never fills its own eyes, so games end with
+two passes once nothing useful is left.
+
+    playout = BatchPlayout.fromBoard(board, GoBoard.BLACK, games=2048)
+    scores = playout.run()           # Black area minus White area, per game
+    ownership = playout.getOwnership()
+
+GameState uses estimateOwnership() to find dead stones when scoring.
+Needs numpy, so it is not imported by the package __init__.
+"""
+
+import numpy as np
+from .board import GoBoard
+
+BORDER = 3  # Value of the off-board sentinel point
+
+def _buildNeighborTables(size):
+    # Orthogonal and diagonal neighbours of every point as flat indices;
+    # off-board neighbours point at the sentinel index size * size
+    points = size * size
+    neighbors = np.full((points, 4), points, dtype=np.intp)
+    diagonals = np.full((points, 4), points, dtype=np.intp)
+    for row in range(size):
+        for col in range(size):
+            offsets = ((-1, 0), (1, 0), (0, -1), (0, 1))
+            for slot, (dr, dc) in enumerate(offsets):
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    neighbors[row * size + col, slot] = nr * size + nc
+            for slot, (dr, dc) in enumerate(((-1, -1), (-1, 1), (1, -1), (1, 1))):
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    diagonals[row * size + col, slot] = nr * size + nc
+    return neighbors, diagonals
+
+class BatchPlayout:
+
+    EMPTY = GoBoard.EMPTY
+    BLACK = GoBoard.BLACK
+    WHITE = GoBoard.WHITE
+
+    def __init__(self, games, size=GoBoard.BOARD_SIZE, seed=None, max_moves=None):
+        self.games = games
+        self.size = size
+        self.points = size * size
+        # Cap on moves per game; random play can cycle through superko
+        self.max_moves = max_moves or 3 * self.points
+        self.rng = np.random.default_rng(seed)
+        self.neighbors, self.diagonals = _buildNeighborTables(size)
+
+        # Point-major layout (point, game) keeps neighbour gathers contiguous;
+        # row `points` is the off-board sentinel
+        self.boards = np.zeros((self.points + 1, games), dtype=np.int8)
+        self.boards[self.points] = BORDER
+        self.to_move = np.full(games, self.BLACK, dtype=np.int8)
+        self.ko = np.full(games, -1, dtype=np.intp)
+        self.passes = np.zeros(games, dtype=np.int8)
+        self.moves = np.zeros(games, dtype=np.int32)
+        self.done = np.zeros(games, dtype=bool)
+
+        self.steps = 0
+        self.captures = 0
+
+    @classmethod
+    def fromBoard(cls, board, color, games, seed=None, max_moves=None):
+        playout = cls(games, board.size, seed, max_moves)
+        playout.reset(board, color)
+        return playout
+
+    def reset(self, board, color):
+        # Every game starts from board with color to move
+        self.boards[:self.points] = np.asarray(board.board, dtype=np.int8).reshape(-1, 1)
+        self.to_move[:] = color
+        ko = -1 if board.ko_point is None else board.ko_point[0] * self.size + board.ko_point[1]
+        self.ko[:] = ko
+        self.passes[:] = 0
+        self.moves[:] = 0
+        self.done[:] = False
+
+    def run(self):
+        """Play every game to the end; returns Black area minus White area"""
+        while self.step():
+            pass
+        return self.getScores()
+
+    def step(self):
+        """Play one move (or pass) in every unfinished game; returns how many remain"""
+        active = ~self.done
+        if not active.any():
+            return 0
+
+        labels, liberties = self._labelStrings()
+        legal = self._legalMoves(labels, liberties) & active
+        has_move = legal.any(axis=0)
+
+        # Uniformly random legal point per game
+        choice = np.where(legal, self.rng.random(legal.shape), -1.0).argmax(axis=0)
+        games = np.flatnonzero(has_move)
+        if games.size:
+            self._playMoves(games, choice[games], labels, liberties)
+
+        passing = active & ~has_move
+        self.passes[passing] += 1
+        self.passes[has_move] = 0
+        self.ko[passing] = -1
+        self.moves[active] += 1
+        self.to_move[active] = 3 - self.to_move[active]
+        self.done |= (self.passes >= 2) | (self.moves >= self.max_moves)
+
+        self.steps += 1
+        return int((~self.done).sum())
+
+    def _labelStrings(self):
+        # Label every stone with the smallest point index of its string by
+        # min-propagation, then count distinct liberties
+        points = self.points
+        boards = self.boards
+        own = boards[:points]
+        stones = (own == self.BLACK) | (own == self.WHITE)
+        no_label = points + 1
+
+        labels = np.full((points + 1, self.games), no_label, dtype=np.int16)
+        labels[:points] = np.where(stones, np.arange(points, dtype=np.int16)[:, None], no_label)
+        neighbors = [self.neighbors[:, slot] for slot in range(4)]
+        # Added to a neighbour's label unless it is the same string, so that
+        # minimum() only ever propagates within strings (cheaper than where())
+        barriers = [((boards[neighbor] != own) | ~stones).astype(np.int16) * no_label
+                    for neighbor in neighbors]
+        columns = np.arange(self.games)
+
+        while True:
+            updated = labels[:points].copy()
+            for neighbor, barrier in zip(neighbors, barriers):
+                np.minimum(updated, labels[neighbor] + barrier, out=updated)
+            if np.array_equal(updated, labels[:points]):
+                break
+            labels[:points] = updated
+
+        # Each empty point is one liberty of every distinct string around it
+        empty = own == self.EMPTY
+        around = [labels[neighbor] for neighbor in neighbors]
+        flat = []
+        for slot in range(4):
+            distinct = empty & (around[slot] != no_label)
+            for earlier in range(slot):
+                distinct &= around[slot] != around[earlier]
+            flat.append((around[slot].astype(np.intp) * self.games + columns)[distinct])
+        liberties = np.bincount(np.concatenate(flat), minlength=(points + 2) * self.games)
+        return labels, liberties.reshape(points + 2, self.games)
+
+    def _legalMoves(self, labels, liberties):
+        points = self.points
+        boards = self.boards
+        columns = np.arange(self.games)
+        color = self.to_move
+        opponent = 3 - color
+        # Liberties of the string on every point (junk on empty points)
+        point_liberties = liberties.ravel().take(labels.astype(np.intp) * self.games + columns)
+
+        has_liberty = np.zeros((points, self.games), dtype=bool)
+        connects = np.zeros_like(has_liberty)
+        captures = np.zeros_like(has_liberty)
+        own_eye = np.ones_like(has_liberty)
+        for slot in range(4):
+            neighbor = self.neighbors[:, slot]
+            around = boards[neighbor]
+            around_liberties = point_liberties[neighbor]
+            # Legal if it keeps a liberty, joins a string that has another
+            # one, or captures an opponent string in atari
+            has_liberty |= around == self.EMPTY
+            connects |= (around == color) & (around_liberties >= 2)
+            captures |= (around == opponent) & (around_liberties == 1)
+            own_eye &= (around == color) | (around == BORDER)
+        legal = (boards[:points] == self.EMPTY) & (has_liberty | connects | captures)
+
+        ko_games = np.flatnonzero(self.ko >= 0)
+        legal[self.ko[ko_games], ko_games] = False
+
+        # Never fill an own eye: all neighbours friendly and too few enemy
+        # diagonals to make it false (none allowed on the edge)
+        diagonal = boards[self.diagonals]
+        enemy_diagonals = (diagonal == opponent).sum(axis=1)
+        on_edge = (diagonal == BORDER).any(axis=1)
+        true_eye = own_eye & (enemy_diagonals < np.where(on_edge, 1, 2))
+        return legal & ~true_eye
+
+    def _playMoves(self, games, moves, labels, liberties):
+        points = self.points
+        color = self.to_move[games]
+        self.boards[moves, games] = color
+
+        # Opponent strings next to the move with that move as last liberty
+        around = self.neighbors[moves]
+        around_labels = labels[around, games[:, None]]
+        captured = ((self.boards[around, games[:, None]] == (3 - color)[:, None]) &
+                    (liberties[around_labels, games[:, None]] == 1))
+
+        capture_flags = np.zeros((points + 2, self.games), dtype=bool)
+        capture_games = np.broadcast_to(games[:, None], captured.shape)
+        capture_flags[around_labels[captured], capture_games[captured]] = True
+        removed = capture_flags[labels[:points], np.arange(self.games)]
+        self.boards[:points][removed] = self.EMPTY
+
+        # Same simple ko as GoBoard: any single-stone capture
+        removed_count = removed.sum(axis=0)[games]
+        self.ko[games] = np.where(removed_count == 1, removed[:, games].argmax(axis=0), -1)
+        self.captures += int(removed_count.sum())
+
+    def getOwnership(self):
+        """Area owner of every point per game, shape (games, size, size)"""
+        points = self.points
+        boards = self.boards
+        empty = boards[:points] == self.EMPTY
+        ownership = boards[:points].copy()
+
+        reach = {}
+        for color in (self.BLACK, self.WHITE):
+            reached = np.zeros((points + 1, self.games), dtype=bool)
+            reached[:points] = empty & (boards[self.neighbors] == color).any(axis=1)
+            while True:
+                grown = empty & (reached[:points] | reached[self.neighbors].any(axis=1))
+                if np.array_equal(grown, reached[:points]):
+                    break
+                reached[:points] = grown
+            reach[color] = reached[:points]
+
+        ownership[empty & reach[self.BLACK] & ~reach[self.WHITE]] = self.BLACK
+        ownership[empty & reach[self.WHITE] & ~reach[self.BLACK]] = self.WHITE
+        return ownership.T.reshape(self.games, self.size, self.size)
+
+    @classmethod
+    def estimateOwnership(cls, board, color, games, seed=None):
+        """Mean area owner of every point over games playouts from board:
+        +1 always Black, -1 always White, shape (size, size)"""
+        playout = cls.fromBoard(board, color, games, seed)
+        playout.run()
+        ownership = playout.getOwnership()
+        return (ownership == cls.BLACK).mean(axis=0) - (ownership == cls.WHITE).mean(axis=0)
+
+    def getScores(self):
+        ownership = self.getOwnership().reshape(self.games, -1)
+        return ((ownership == self.BLACK).sum(axis=1) -
+                (ownership == self.WHITE).sum(axis=1)).astype(np.int32)
+
+    def getStats(self):
+        return {
+            'games': self.games,
+            'steps': self.steps,
+            'moves_played': int(self.moves.sum()),
+            'captures': self.captures,
+            'finished': int(self.done.sum()),
+        }
@@ -0,0 +1,114 @@
+"""Board symmetries (the 8 rotations/reflections of the square).
+
+GoBoard keeps one Zobrist hash per symmetry, each one hashing the position
+as seen through that transform. They are updated incrementally with every
+stone change, so the canonical key of a position (the smallest of the 8
+hashes) is available in constant time and is identical for all positions
+in the same equivalence class. Caches and opening books key on it, storing
+moves in the canonical frame; search uses the hashes to detect symmetric
+positions and skip moves that are mirror images of each other.
+"""
+
+import random
+
+SYMMETRY_COUNT = 8
+ZOBRIST_SEED = 0x60B0A4D  # Fixed so keys are stable across processes and runs
+
+def transformPoint(symmetry, row, col, size):
+    # Bit 0: mirror columns, bit 1: mirror rows, bit 2: transpose (applied first)
+    if symmetry & 4:
+        row, col = col, row
+    if symmetry & 2:
+        row = size - 1 - row
+    if symmetry & 1:
+        col = size - 1 - col
+    return row, col
+
+def inverseSymmetry(symmetry):
+    # Reflections are their own inverse; the two rotations (transpose + one
+    # mirror) swap with each other
+    if symmetry in (5, 6):
+        return 11 - symmetry
+    return symmetry
+
+def buildZobristTables(size, colors=3):
+    """Return (point_keys, symmetric_keys, ko_keys).
+
+    point_keys[color][row][col] is the Zobrist key of a stone (0 for EMPTY);
+    symmetric_keys[color][row][col][s] is the key of that stone after
+    transform s; ko_keys[row][col][s] is the same for a ko point.
+    """
+    rng = random.Random(ZOBRIST_SEED)
+    point_keys = [[[0] * size for _ in range(size)]]
+    for _ in range(1, colors):
+        point_keys.append([[rng.getrandbits(64) for _ in range(size)] for _ in range(size)])
+    ko_point_keys = [[rng.getrandbits(64) for _ in range(size)] for _ in range(size)]
+
+    def symmetric(keys):
+        table = [[None] * size for _ in range(size)]
+        for row in range(size):
+            for col in range(size):
+                table[row][col] = [
+                    keys[r][c]
+                    for r, c in (transformPoint(s, row, col, size) for s in range(SYMMETRY_COUNT))
+                ]
+        return table
+
+    symmetric_keys = [symmetric(keys) for keys in point_keys]
+    return point_keys, symmetric_keys, symmetric(ko_point_keys)
+
+class BoardSymmetry:
+
+    @staticmethod
+    def getSymmetryKeys(board):
+        # Hashes of the position under each transform, ko point included
+        if board.ko_point is None:
+            return list(board.symmetry_hashes)
+        ko_keys = board.KO_ZOBRIST[board.ko_point[0]][board.ko_point[1]]
+        return [h ^ k for h, k in zip(board.symmetry_hashes, ko_keys)]
+
+    @staticmethod
+    def canonicalize(board):
+        """Return (canonical_key, symmetry) mapping board to its canonical frame"""
+        keys = BoardSymmetry.getSymmetryKeys(board)
+        symmetry = min(range(SYMMETRY_COUNT), key=keys.__getitem__)
+        return keys[symmetry], symmetry
+
+    @staticmethod
+    def getCanonicalKey(board):
+        return min(BoardSymmetry.getSymmetryKeys(board))
+
+    @staticmethod
+    def getInvariantSymmetries(board):
+        # Transforms that map the position onto itself (always includes 0)
+        keys = BoardSymmetry.getSymmetryKeys(board)
+        return [s for s in range(SYMMETRY_COUNT) if keys[s] == keys[0]]
+
+    @staticmethod
+    def toCanonicalMove(move, symmetry, size):
+        if move is None:
+            return None
+        return transformPoint(symmetry, move[0], move[1], size)
+
+    @staticmethod
+    def fromCanonicalMove(move, symmetry, size):
+        if move is None:
+            return None
+        return transformPoint(inverseSymmetry(symmetry), move[0], move[1], size)
+
+    @staticmethod
+    def uniqueMoves(board, moves):
+        """Drop moves that are mirror images of an earlier move in the list"""
+        symmetries = BoardSymmetry.getInvariantSymmetries(board)
+        if len(symmetries) == 1:
+            return moves
+
+        seen = set()
+        unique = []
+        for row, col in moves:
+            if (row, col) in seen:
+                continue
+            unique.append((row, col))
+            for s in symmetries:
+                seen.add(transformPoint(s, row, col, board.size))
+        return unique
@@ -1,9 +1,9 @@
-import threading
+import time
 import pygame
 import sys
 from ..game.game_state import GameState
 from ..game.board import GoBoard
-from ..ai.minimax import MinimaxAI
+from ..engine.ai_process import AiProcess
 
 class GoGameUI:
     
@@ -14,6 +14,7 @@ class GoGameUI:
     WHITE_STONE = (255, 255, 255)
     GRID_COLOR = (50, 50, 50)
     HIGHLIGHT_COLOR = (255, 0, 0)
+    SEARCH_COLOR = (0, 120, 255)  # AI's current best move while thinking
     TEXT_COLOR = (0, 0, 0)
     BUTTON_COLOR = (100, 149, 237)
     BUTTON_HOVER = (65, 105, 225)
@@ -24,15 +25,21 @@ class GoGameUI:
     STONE_RADIUS = 25
     GRID_SIZE = 9
     
-    def __init__(self, mode=GameState.MODE_PVAI):
+    # Rendering
+    FPS = 30
+    IDLE_WAIT_MS = 250  # Longest sleep between checks while nothing changes
+    AI_POLL_MS = 30     # Sleep between result checks while the AI thinks
+    
+    def __init__(self, mode=GameState.MODE_PVAI, dirty_rendering=True):
         pygame.init()
         
         self.mode = mode
-        self.game_state = GameState(mode)
+        self.game_state = self._newGameState()
         
-        self.ai = None
-        if mode == GameState.MODE_PVAI:
-            self.ai = MinimaxAI(GoBoard.WHITE, depth=3, time_limit=5.0)
+        # The search runs in a persistent worker process (started right away
+        # so the first AI move does not pay for process startup)
+        self.ai_process = AiProcess(GoBoard.WHITE, depth=3, time_limit=5.0).start()
+        self.ai = self.ai_process if mode == GameState.MODE_PVAI else None
         
         # Window setup
         self.board_size = self.CELL_SIZE * (self.GRID_SIZE - 1) + 2 * self.MARGIN
@@ -52,13 +59,38 @@ class GoGameUI:
         self.hover_pos = None
         self.thinking = False
         self.message = ""
+        self.show_ownership = False  # Toggled with the 'T' key
         
         # Buttons
         self.buttons = self._createButtons()
-        self.ai_thread = None
+        self.hovered_button = None
+        
+        # Rendering state. In dirty mode the grid is pre-rendered once, stones
+        # are redrawn onto board_layer only when the position changes, and
+        # only dirty rectangles are pushed to the display.
+        self.dirty_rendering = dirty_rendering
+        self.board_rect = pygame.Rect(0, 0, self.board_size, self.board_size)
+        self.panel_rect = pygame.Rect(self.board_size, 0, self.info_panel_width, self.window_height)
+        self.board_surface = self._createBoardSurface()
+        self.board_layer = self.board_surface.copy()
+        self.board_layer_key = None
+        self.state_key = None
+        self.dirty_rects = [self.screen.get_rect()]
+        self.clock = pygame.time.Clock()
+        
+        # Render stats: frames drawn and CPU time of the UI thread
+        self.frames_drawn = 0
+        self.ui_cpu_time = 0.0
+        
         self.pending_ai_move = None
         self.ai_move_ready = False
         self.ai_stats = None
+        self.ai_progress = None  # Latest search progress event from the worker
+        self.scoring = False  # Worker is scoring the finished game
+    
+    def _newGameState(self):
+        # Playouts that score a finished game run in the AI worker
+        return GameState(self.mode, playouts=0)
     
     def _createButtons(self):
         button_x = self.board_size + 20
@@ -75,45 +107,112 @@ class GoGameUI:
         return buttons
     
     def run(self):
-        clock = pygame.time.Clock()
         running = True
         
         while running:
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                elif event.type == pygame.MOUSEMOTION:
-                    self._handleMouseMotion(event.pos)
-                
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    self._handleMouseClick(event.pos)
+            running = self._tick()
+        
+        self.ai_process.close()
+        pygame.quit()
+        sys.exit()
+    
+    def _tick(self):
+        cpu_start = time.thread_time()
+        running = True
+        
+        # Handle events
+        for event in self._getEvents():
+            if event.type == pygame.QUIT:
+                running = False
             
-            self._applyPendingAiMove()
-
-            # AI move (if applicable)
-            if (not self.thinking and 
-                not self.game_state.game_over and 
-                self.mode == GameState.MODE_PVAI and 
-                self.game_state.current_player == self.ai.color):
-                self._startAiMove()
+            elif event.type == pygame.MOUSEMOTION:
+                self._handleMouseMotion(event.pos)
+            
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self._handleMouseClick(event.pos)
+            
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                self.show_ownership = not self.show_ownership
             
-            # Draw everything
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._markDirty()
+        
+        self._pollAiMove()
+        self._applyPendingAiMove()
+        self._pollScoring()
+        
+        if (not self.scoring and self.game_state.game_over and
+            not self.game_state.hasOwnershipEstimate()):
+            self._startScoring()
+
+        # AI move (if applicable)
+        if (not self.thinking and 
+            not self.game_state.game_over and 
+            self.mode == GameState.MODE_PVAI and 
+            self.game_state.current_player == self.ai.color):
+            self._startAiMove()
+        
+        # Draw everything
+        if self.dirty_rendering:
+            self._checkStateChanged()
+            if self.dirty_rects:
+                self._drawDirty()
+        else:
             self._draw()
             pygame.display.flip()
-            clock.tick(30)
+            self.frames_drawn += 1
         
-        pygame.quit()
-        sys.exit()
+        self.ui_cpu_time += time.thread_time() - cpu_start
+        self.clock.tick(self.FPS)
+        return running
+    
+    def _getEvents(self):
+        events = pygame.event.get()
+        if events or not self.dirty_rendering or self.dirty_rects or self.ai_move_ready:
+            return events
+        
+        # Idle: sleep until the next event, waking up to poll the AI worker
+        busy = self.thinking or self.scoring
+        event = pygame.event.wait(self.AI_POLL_MS if busy else self.IDLE_WAIT_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
+    def _markDirty(self, rect=None):
+        self.dirty_rects.append(rect or self.screen.get_rect())
+    
+    def _checkStateChanged(self):
+        # Anything shown outside hover/button highlights is derived from this
+        state = self.game_state
+        board_key = (id(state), state.version, state.hasOwnershipEstimate(), self.show_ownership,
+                     self._searchBestMove())
+        state_key = (board_key, self.thinking, self.scoring, self.message, self.mode,
+                     state.game_over, self.ai_progress)
+        
+        if state_key != self.state_key:
+            self.state_key = state_key
+            self._markDirty()
+        
+        if board_key != self.board_layer_key:
+            self.board_layer_key = board_key
+            self._renderBoardLayer()
     
     def _handleMouseMotion(self, pos):
         # Check if hovering over board
         board_pos = self._screenToBoard(pos)
-        if board_pos:
-            self.hover_pos = board_pos
-        else:
-            self.hover_pos = None
+        if board_pos != self.hover_pos:
+            for cell in (self.hover_pos, board_pos):
+                if cell:
+                    self._markDirty(self._cellRect(*cell))
+        self.hover_pos = board_pos
+        
+        hovered_button = None
+        for button_name, button_rect in self.buttons.items():
+            if button_rect.collidepoint(pos):
+                hovered_button = button_name
+        if hovered_button != self.hovered_button:
+            self.hovered_button = hovered_button
+            self._markDirty(self.panel_rect)
     
     def _handleMouseClick(self, pos):
         # Check buttons
@@ -138,8 +237,12 @@ class GoGameUI:
                 self.message = "Invalid move!"
     
     def _handleButtonClick(self, button_name):
+        if button_name in ('new_game', 'pvp', 'pvai'):
+            # The running search belongs to the game being replaced
+            self._cancelAiMove()
+        
         if button_name == 'new_game':
-            self.game_state = GameState(self.mode)
+            self.game_state = self._newGameState()
             self.message = "New game started!"
         
         elif button_name == 'pass':
@@ -150,17 +253,17 @@ class GoGameUI:
         elif button_name == 'pvp':
             self.mode = GameState.MODE_PVP
             self.ai = None
-            self.game_state = GameState(self.mode)
+            self.game_state = self._newGameState()
             self.message = "Mode: Player vs Player"
         
         elif button_name == 'pvai':
             self.mode = GameState.MODE_PVAI
-            self.ai = MinimaxAI(GoBoard.WHITE, depth=3, time_limit=5.0)
-            self.game_state = GameState(self.mode)
+            self.ai = self.ai_process
+            self.game_state = self._newGameState()
             self.message = "Mode: Player vs AI"
     
     def _startAiMove(self):
-        if self.ai_thread is not None or not self.ai:
+        if self.ai_process.isBusy() or not self.ai:
             return
 
         self.thinking = True
@@ -168,28 +271,68 @@ class GoGameUI:
         self.ai_move_ready = False
         self.pending_ai_move = None
         self.ai_stats = None
+        self.ai_progress = None
 
-        ai_snapshot = self.ai
-        self.ai_thread = threading.Thread(target=self._aiMoveWorker, args=(ai_snapshot,), daemon=True)
-        self.ai_thread.start()
+        self.ai.requestMove(self.game_state.board, pass_count=self.game_state.pass_count)
+
+    def _pollAiMove(self):
+        if not self.thinking or self.ai_move_ready:
+            return
 
-    def _aiMoveWorker(self, ai_instance):
-        move = ai_instance.getBestMove(self.game_state.board)
-        stats = ai_instance.getStats()
-        self.pending_ai_move = move
-        self.ai_stats = stats
-        self.ai_move_ready = True
+        try:
+            result = self.ai_process.poll()
+        except RuntimeError as e:
+            self.thinking = False
+            self.message = f"AI error: {e}"
+            return
+        
+        self.ai_progress = self.ai_process.progress
+        if result is not None:
+            self.pending_ai_move, self.ai_stats = result
+            self.ai_move_ready = True
+
+    def _startScoring(self):
+        if self.ai_process.isBusy():
+            return
+        self.scoring = True
+        self.ai_process.requestOwnership(self.game_state.board)
+
+    def _pollScoring(self):
+        if not self.scoring:
+            return
+
+        try:
+            result = self.ai_process.poll()
+        except RuntimeError as e:
+            # Score without dead stones rather than retry forever
+            self.game_state.setOwnershipEstimate(None)
+            self.scoring = False
+            self.message = f"AI error: {e}"
+            return
+
+        if result is not None:
+            self.game_state.setOwnershipEstimate(result[0])
+            self.scoring = False
+
+    def _cancelAiMove(self):
+        self.ai_process.cancel()
+        self.scoring = False
+        self.thinking = False
+        self.ai_move_ready = False
+        self.pending_ai_move = None
+        self.ai_stats = None
+        self.ai_progress = None
 
     def _applyPendingAiMove(self):
         if not self.ai_move_ready:
             return
 
         self.ai_move_ready = False
-        self.ai_thread = None
         move = self.pending_ai_move
         stats = self.ai_stats or {}
         self.pending_ai_move = None
         self.ai_stats = None
+        self.ai_progress = None
 
         if self.mode != GameState.MODE_PVAI or self.game_state.game_over:
             self.thinking = False
@@ -228,12 +371,55 @@ class GoGameUI:
         y = self.MARGIN + row * self.CELL_SIZE
         return (x, y)
     
+    def _cellRect(self, row, col):
+        x, y = self._boardToScreen(row, col)
+        half = self.CELL_SIZE // 2
+        return pygame.Rect(x - half, y - half, self.CELL_SIZE, self.CELL_SIZE)
+    
+    def _createBoardSurface(self):
+        # Static background: wood, grid lines and star points
+        surface = pygame.Surface((self.board_size, self.board_size)).convert()
+        surface.fill(self.BOARD_COLOR)
+        self._drawBoard(surface)
+        return surface
+    
+    def _renderBoardLayer(self):
+        # Board background plus stones; rebuilt only when the position changes
+        self.board_layer.blit(self.board_surface, (0, 0))
+        self._drawStones(self.board_layer)
+        if self.show_ownership:
+            self._drawOwnership(self.board_layer)
+        self._drawSearchHighlight(self.board_layer)
+    
+    def _drawDirty(self):
+        rects = [rect.clip(self.screen.get_rect()) for rect in self.dirty_rects]
+        self.dirty_rects = []
+        
+        for rect in rects:
+            board_part = rect.clip(self.board_rect)
+            if board_part.width and board_part.height:
+                self.screen.blit(self.board_layer, board_part, board_part)
+        
+        if self.hover_pos and self._cellRect(*self.hover_pos).collidelist(rects) != -1:
+            if not self.game_state.game_over and not self.thinking:
+                self._drawHover()
+        
+        if self.panel_rect.collidelist(rects) != -1:
+            self._drawInfoPanel()
+        
+        pygame.display.update(rects)
+        self.frames_drawn += 1
+    
     def _draw(self):
         self.screen.fill(self.BOARD_COLOR)
         
         # Draw board and stones
-        self._drawBoard()
-        self._drawStones()
+        self._drawBoard(self.screen)
+        self._drawStones(self.screen)
+        
+        if self.show_ownership:
+            self._drawOwnership(self.screen)
+        self._drawSearchHighlight(self.screen)
         
         # Draw hover indicator
         if self.hover_pos and not self.game_state.game_over and not self.thinking:
@@ -242,28 +428,28 @@ class GoGameUI:
         # Draw info panel
         self._drawInfoPanel()
     
-    def _drawBoard(self):
+    def _drawBoard(self, surface):
         # Draw grid lines
         for i in range(self.GRID_SIZE):
             # Horizontal lines
             start_x = self.MARGIN
             end_x = self.MARGIN + (self.GRID_SIZE - 1) * self.CELL_SIZE
             y = self.MARGIN + i * self.CELL_SIZE
-            pygame.draw.line(self.screen, self.LINE_COLOR, (start_x, y), (end_x, y), 2)
+            pygame.draw.line(surface, self.LINE_COLOR, (start_x, y), (end_x, y), 2)
             
             # Vertical lines
             x = self.MARGIN + i * self.CELL_SIZE
             start_y = self.MARGIN
             end_y = self.MARGIN + (self.GRID_SIZE - 1) * self.CELL_SIZE
-            pygame.draw.line(self.screen, self.LINE_COLOR, (x, start_y), (x, end_y), 2)
+            pygame.draw.line(surface, self.LINE_COLOR, (x, start_y), (x, end_y), 2)
         
         # Draw star points (2-2, 2-6, 6-2, 6-6, 4-4)
         star_points = [(2, 2), (2, 6), (6, 2), (6, 6), (4, 4)]
         for row, col in star_points:
             x, y = self._boardToScreen(row, col)
-            pygame.draw.circle(self.screen, self.LINE_COLOR, (x, y), 5)
+            pygame.draw.circle(surface, self.LINE_COLOR, (x, y), 5)
     
-    def _drawStones(self):
+    def _drawStones(self, surface):
         board = self.game_state.board
         
         for row in range(self.GRID_SIZE):
@@ -272,19 +458,47 @@ class GoGameUI:
                 
                 if stone == GoBoard.BLACK:
                     x, y = self._boardToScreen(row, col)
-                    pygame.draw.circle(self.screen, self.BLACK_STONE, (x, y), self.STONE_RADIUS)
-                    pygame.draw.circle(self.screen, self.LINE_COLOR, (x, y), self.STONE_RADIUS, 2)
+                    pygame.draw.circle(surface, self.BLACK_STONE, (x, y), self.STONE_RADIUS)
+                    pygame.draw.circle(surface, self.LINE_COLOR, (x, y), self.STONE_RADIUS, 2)
                 
                 elif stone == GoBoard.WHITE:
                     x, y = self._boardToScreen(row, col)
-                    pygame.draw.circle(self.screen, self.WHITE_STONE, (x, y), self.STONE_RADIUS)
-                    pygame.draw.circle(self.screen, self.LINE_COLOR, (x, y), self.STONE_RADIUS, 2)
+                    pygame.draw.circle(surface, self.WHITE_STONE, (x, y), self.STONE_RADIUS)
+                    pygame.draw.circle(surface, self.LINE_COLOR, (x, y), self.STONE_RADIUS, 2)
         
         # Highlight last move
         if board.last_move:
             row, col = board.last_move
             x, y = self._boardToScreen(row, col)
-            pygame.draw.circle(self.screen, self.HIGHLIGHT_COLOR, (x, y), 8, 3)
+            pygame.draw.circle(surface, self.HIGHLIGHT_COLOR, (x, y), 8, 3)
+    
+    def _drawOwnership(self, surface):
+        # Territory overlay, read from GameState's cached score
+        board = self.game_state.board
+        ownership = self.game_state.getOwnership()
+        size = self.STONE_RADIUS // 2
+        
+        for row in range(self.GRID_SIZE):
+            for col in range(self.GRID_SIZE):
+                owner = ownership[row][col]
+                if owner == GoBoard.EMPTY or board.getStone(row, col) == owner:
+                    continue
+                
+                x, y = self._boardToScreen(row, col)
+                color = self.BLACK_STONE if owner == GoBoard.BLACK else self.WHITE_STONE
+                pygame.draw.rect(surface, color, (x - size // 2, y - size // 2, size, size))
+    
+    def _searchBestMove(self):
+        if self.thinking and self.ai_progress:
+            return self.ai_progress.get('best_move')
+        return None
+    
+    def _drawSearchHighlight(self, surface):
+        move = self._searchBestMove()
+        if move:
+            x, y = self._boardToScreen(*move)
+            pygame.draw.circle(surface, self.SEARCH_COLOR, (x, y), self.STONE_RADIUS, 3)
+            pygame.draw.circle(surface, self.SEARCH_COLOR, (x, y), 4)
     
     def _drawHover(self):
         if self.hover_pos:
@@ -334,8 +548,11 @@ class GoGameUI:
         # Game over message
         if self.game_state.game_over:
             y_offset += 40
-            winner = "Black" if self.game_state.winner == GoBoard.BLACK else "White"
-            winner_text = self.font.render(f"{winner} Wins!", True, (255, 0, 0))
+            if self.scoring:
+                result = "Counting..."
+            else:
+                result = f"{'Black' if self.game_state.winner == GoBoard.BLACK else 'White'} Wins!"
+            winner_text = self.font.render(result, True, (255, 0, 0))
             self.screen.blit(winner_text, (panel_x + 20, y_offset))
         
         # Message
@@ -361,9 +578,35 @@ class GoGameUI:
                 self.screen.blit(msg_text, (panel_x + 20, y_offset))
                 y_offset += 22
         
+        # Live search progress
+        if self.thinking and self.ai_progress:
+            for line in self._formatProgress(self.ai_progress):
+                progress_text = self.small_font.render(line, True, self.SEARCH_COLOR)
+                self.screen.blit(progress_text, (panel_x + 20, y_offset))
+                y_offset += 20
+        
         # Buttons
         self._drawButtons()
     
+    def _formatProgress(self, progress):
+        def formatMove(move):
+            return f"({move[0]},{move[1]})" if move else "-"
+        
+        best = f"Best {formatMove(progress.get('best_move'))}"
+        if progress.get('score') is not None:
+            best += f"  score {progress['score']:.1f}"
+        
+        lines = [
+            f"Depth {progress['depth']}  move {progress['root_move']}/{progress['root_moves']}",
+            best,
+            f"{progress['nps']:.0f} nodes/s  {progress['elapsed']:.1f}s",
+        ]
+        
+        pv = ' '.join(formatMove(move) for move in progress.get('pv', [])[:4])
+        if pv:
+            lines.append(f"PV {pv}")
+        return lines
+    
     def _drawButtons(self):
         mouse_pos = pygame.mouse.get_pos()
         